@@ -0,0 +1,146 @@
+"""
+Import-time and class-creation benchmarks for large config schemas.
+
+Run from the repository root::
+
+  $ python benchmarks/bench_import.py --json baseline.json
+  $ python benchmarks/bench_import.py --compare baseline.json
+"""
+
+import inspect
+import os
+import subprocess
+import sys
+
+# This puts the repository root on sys.path, so it must be imported before
+# confmodel.
+from harness import benchmark_registry, main
+
+from confmodel.config import (
+    Config, ConfigMetaClass, find_field_names, generate_doc)
+from confmodel.fields import ConfigText, ConfigInt
+
+
+BENCHMARKS, benchmark = benchmark_registry()
+
+FIELD_DOC = (
+    "A field with a reasonably long description, which needs to be wrapped"
+    " over more than one line when the class docstring is generated.")
+
+
+def make_fields(count, prefix="field"):
+    fields = {}
+    for i in range(count):
+        field_cls = ConfigText if i % 2 else ConfigInt
+        fields["%s_%d" % (prefix, i)] = field_cls(FIELD_DOC)
+    return fields
+
+
+# Process startup.
+
+def import_benchmark(name, statement):
+    @benchmark("import_%s" % (name,))
+    def setup():
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(sys.path)
+        command = [sys.executable, '-c', statement]
+        return lambda: subprocess.check_call(command, env=env)
+
+
+import_benchmark("python", "pass")
+import_benchmark("confmodel", "import confmodel")
+import_benchmark(
+    "confmodel_all", "import confmodel.fields, confmodel.fallbacks")
+
+
+# Class creation.
+
+def wide_class_benchmark(field_count):
+    @benchmark("class_wide_%d_fields" % (field_count,))
+    def setup():
+        fields = make_fields(field_count)
+        return lambda: ConfigMetaClass('WideConfig', (Config,), dict(fields))
+
+
+for field_count in [10, 1000, 5000]:
+    wide_class_benchmark(field_count)
+
+
+def make_deep_hierarchy(depth, fields_per_class):
+    classes = [Config]
+    for level in range(depth):
+        fields = make_fields(fields_per_class, "level_%d" % (level,))
+        classes.append(ConfigMetaClass(
+            'DeepConfig%d' % (level,), (classes[-1],), fields))
+    return classes[1:]
+
+
+def deep_class_benchmark(depth, fields_per_class):
+    @benchmark("class_deep_%d_levels" % (depth,))
+    def setup():
+        return lambda: make_deep_hierarchy(depth, fields_per_class)
+
+
+deep_class_benchmark(10, 10)
+deep_class_benchmark(50, 10)
+
+
+def make_mixins(count, fields_per_mixin):
+    return tuple(
+        type('Mixin%d' % (i,), (object,),
+             make_fields(fields_per_mixin, "mixin_%d" % (i,)))
+        for i in range(count))
+
+
+def mixin_class_benchmark(mixin_count, fields_per_mixin):
+    @benchmark("class_%d_mixins" % (mixin_count,))
+    def setup():
+        bases = (Config,) + make_mixins(mixin_count, fields_per_mixin)
+        fields = make_fields(10)
+        return lambda: ConfigMetaClass('MixinConfig', bases, dict(fields))
+
+
+mixin_class_benchmark(10, 10)
+mixin_class_benchmark(50, 10)
+
+
+# The individual steps of class creation.
+
+def field_discovery_benchmarks(name, make_bases):
+    @benchmark("find_field_names_%s" % (name,))
+    def setup_find_field_names():
+        bases = make_bases()
+        fields = make_fields(10)
+        return lambda: find_field_names(bases, fields)
+
+    @benchmark("inspect_getmembers_%s" % (name,))
+    def setup_inspect_getmembers():
+        bases = make_bases()
+
+        def getmembers():
+            for base in bases:
+                inspect.getmembers(base)
+        return getmembers
+
+
+field_discovery_benchmarks(
+    "deep_50_levels", lambda: (make_deep_hierarchy(50, 10)[-1],))
+field_discovery_benchmarks(
+    "50_mixins", lambda: (Config,) + make_mixins(50, 10))
+
+
+def generate_doc_benchmark(field_count):
+    @benchmark("generate_doc_%d_fields" % (field_count,))
+    def setup():
+        config_cls = ConfigMetaClass(
+            'DocConfig', (Config,), make_fields(field_count))
+        fields = config_cls._get_fields()
+        return lambda: generate_doc("A config class.", fields)
+
+
+generate_doc_benchmark(10)
+generate_doc_benchmark(1000)
+
+
+if __name__ == '__main__':
+    sys.exit(main(BENCHMARKS, __doc__.strip().splitlines()[0]))
@@ -0,0 +1,135 @@
+"""
+Runtime benchmarks for config construction and field access.
+
+Run from the repository root::
+
+  $ python benchmarks/bench_runtime.py --json baseline.json
+  $ python benchmarks/bench_runtime.py --compare baseline.json
+"""
+
+import sys
+
+# This puts the repository root on sys.path, so it must be imported before
+# confmodel.
+from harness import benchmark_registry, main
+
+from confmodel.config import Config, ConfigField, ConfigMetaClass
+from confmodel.fallbacks import SingleFieldFallback, FormatStringFieldFallback
+from confmodel.fields import (
+    ConfigText, ConfigInt, ConfigFloat, ConfigBool, ConfigList, ConfigDict,
+    ConfigUrl, ConfigRegex)
+from confmodel.interfaces import IConfigData, adapt_config_data
+
+
+BENCHMARKS, benchmark = benchmark_registry()
+
+
+def make_config_class(fields, **attrs):
+    class_dict = dict(fields)
+    class_dict.update(attrs)
+    return ConfigMetaClass('BenchConfig', (Config,), class_dict)
+
+
+# Config construction with many fields.
+
+def init_benchmark(field_count, static):
+    @benchmark("init_%s_fields%s" % (field_count, "_static" if static else ""))
+    def setup():
+        fields = {}
+        config_data = {}
+        for i in range(field_count):
+            name = "field_%d" % (i,)
+            fields[name] = ConfigText(
+                "A text field.", required=(i % 2 == 0), static=(i % 4 == 0))
+            config_data[name] = u"value %d" % (i,)
+        config_cls = make_config_class(fields)
+        return lambda: config_cls(config_data, static=static)
+
+
+for field_count in [10, 100, 1000]:
+    init_benchmark(field_count, static=False)
+    init_benchmark(field_count, static=True)
+
+
+# Config data adaptation, which happens once per construction.
+
+@benchmark("adapt_dict_interface")
+def setup_adapt_dict_interface():
+    config_data = {'field': u"value"}
+    return lambda: IConfigData(config_data)
+
+
+@benchmark("adapt_dict")
+def setup_adapt_dict():
+    config_data = {'field': u"value"}
+    return lambda: adapt_config_data(config_data)
+
+
+# Attribute access for each field type.
+
+FIELD_VALUES = [
+    ('field', ConfigField, {}, u"value"),
+    ('text', ConfigText, {}, u"value"),
+    ('int', ConfigInt, {}, u"42"),
+    ('float', ConfigFloat, {}, u"4.2"),
+    ('bool', ConfigBool, {}, u"true"),
+    ('list', ConfigList, {}, [u"item %d" % i for i in range(100)]),
+    ('list_frozen', ConfigList, {'frozen': True},
+     [u"item %d" % i for i in range(100)]),
+    ('dict', ConfigDict, {}, dict((u"key %d" % i, i) for i in range(100))),
+    ('dict_frozen', ConfigDict, {'frozen': True},
+     dict((u"key %d" % i, i) for i in range(100))),
+    ('url', ConfigUrl, {}, u"http://example.com:8080/path?query=1"),
+    ('regex', ConfigRegex, {}, u"^(foo|bar)+[a-z]{3,}$"),
+]
+
+
+def access_benchmark(name, field_cls, field_kw, value, cache_values):
+    @benchmark("access_%s%s" % (name, "_cached" if cache_values else ""))
+    def setup():
+        config_cls = make_config_class(
+            {'field': field_cls("A field.", **field_kw)},
+            cache_values=cache_values)
+        config = config_cls({'field': value})
+        return lambda: config.field
+
+
+for name, field_cls, field_kw, value in FIELD_VALUES:
+    access_benchmark(name, field_cls, field_kw, value, cache_values=False)
+    access_benchmark(name, field_cls, field_kw, value, cache_values=True)
+
+
+# Fallbacks.
+
+def fallback_chain_benchmark(depth):
+    @benchmark("access_fallback_chain_%d" % (depth,))
+    def setup():
+        fields = {}
+        for i in range(depth):
+            fields["field_%d" % (i,)] = ConfigText(
+                "A text field.",
+                fallbacks=[SingleFieldFallback("field_%d" % (i + 1,))])
+        fields["field_%d" % (depth,)] = ConfigText("The last field.")
+        config_cls = make_config_class(fields)
+        config = config_cls({"field_%d" % (depth,): u"value"})
+        return lambda: config.field_0
+
+
+for depth in [1, 10, 50]:
+    fallback_chain_benchmark(depth)
+
+
+@benchmark("access_format_string_fallback")
+def setup_format_string_fallback():
+    config_cls = make_config_class({
+        'url': ConfigText("A URL.", fallbacks=[FormatStringFieldFallback(
+            u"http://{host}:{port}/", ["host", "port"])]),
+        'host': ConfigText("A host."),
+        'port': ConfigInt("A port."),
+    })
+    config = config_cls({'host': u"example.com", 'port': 8080})
+    return lambda: config.url
+
+
+if __name__ == '__main__':
+    sys.exit(main(BENCHMARKS, __doc__.strip().splitlines()[0]))
@@ -0,0 +1,157 @@
+"""
+Helpers for running confmodel benchmarks and comparing them to baselines.
+
+Each benchmark is a ``(name, setup)`` pair, where ``setup`` is a callable that
+prepares whatever the benchmark needs and returns a callable that performs
+the operation being measured once.
+
+Importing this module puts the root of the repository at the front of
+``sys.path``, so the benchmarks measure the code in the clone they're run
+from, even if confmodel hasn't been installed (or a different version has
+been).
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+
+def benchmark_registry():
+    """
+    Create a list of benchmarks and a decorator that adds setup functions to
+    it under a given name.
+    """
+    benchmarks = []
+
+    def benchmark(name):
+        def decorator(setup):
+            benchmarks.append((name, setup))
+            return setup
+        return decorator
+
+    return benchmarks, benchmark
+
+
+def time_benchmark(setup, repeat, min_time):
+    """
+    Time a single benchmark.
+
+    The number of calls per timing run is chosen so that each run takes at
+    least ``min_time`` seconds, and the fastest of ``repeat`` runs is used.
+
+    :returns:
+        The time taken by a single call, in seconds.
+    """
+    timer = timeit.Timer(setup())
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 10
+    return min(timer.repeat(repeat, number)) / number
+
+
+def run_benchmarks(benchmarks, repeat=5, min_time=0.05, name_filter=None):
+    """
+    Run benchmarks and collect their results.
+
+    :returns:
+        A dict mapping benchmark names to the time taken by a single call, in
+        seconds.
+    """
+    results = {}
+    for name, setup in benchmarks:
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = time_benchmark(setup, repeat, min_time)
+        print "%-50s %12.3f us" % (name, results[name] * 1e6)
+        sys.stdout.flush()
+    return results
+
+
+def compare_results(results, baseline, tolerance):
+    """
+    Compare results with a baseline.
+
+    :returns:
+        A list of ``(name, baseline_time, time)`` tuples for benchmarks that
+        are more than ``tolerance`` (a fraction) slower than the baseline.
+    """
+    regressions = []
+    for name, result in sorted(results.items()):
+        if name not in baseline:
+            continue
+        change = (result - baseline[name]) / baseline[name]
+        print "%-50s %+8.1f%%" % (name, change * 100)
+        if change > tolerance:
+            regressions.append((name, baseline[name], result))
+    return regressions
+
+
+def dump_results(results, filename):
+    data = {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    with open(filename, 'w') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def load_results(filename):
+    with open(filename) as f:
+        return json.load(f)['results']
+
+
+def main(benchmarks, description, argv=None):
+    """
+    Command line entry point shared by all benchmark scripts.
+
+    :returns:
+        An exit code, which is non-zero if any benchmark regressed compared
+        to the baseline.
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        '--filter', help="Only run benchmarks with names containing this.")
+    parser.add_argument(
+        '--repeat', type=int, default=5,
+        help="Number of timing runs per benchmark (default: %(default)s).")
+    parser.add_argument(
+        '--min-time', type=float, default=0.05,
+        help="Minimum duration of each timing run in seconds"
+        " (default: %(default)s).")
+    parser.add_argument(
+        '--json', metavar='FILE', help="Write results to FILE as JSON.")
+    parser.add_argument(
+        '--compare', metavar='FILE',
+        help="Compare results with a baseline previously saved with --json.")
+    parser.add_argument(
+        '--tolerance', type=float, default=0.1,
+        help="Fraction by which a benchmark may be slower than the baseline"
+        " before it counts as a regression (default: %(default)s).")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        benchmarks, args.repeat, args.min_time, args.filter)
+    if args.json:
+        dump_results(results, args.json)
+    if args.compare:
+        print
+        regressions = compare_results(
+            results, load_results(args.compare), args.tolerance)
+        if regressions:
+            print
+            print "%d regression(s):" % (len(regressions),)
+            for name, baseline_time, result in regressions:
+                print "  %s: %.3f us -> %.3f us" % (
+                    name, baseline_time * 1e6, result * 1e6)
+            return 1
+    return 0
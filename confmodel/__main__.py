@@ -0,0 +1,6 @@
+import sys
+
+from confmodel.cli import main
+
+
+sys.exit(main())
@@ -0,0 +1,88 @@
+from collections import OrderedDict
+from threading import Lock
+
+
+class LRUCache(object):
+    """
+    A bounded cache that discards the least recently used items first.
+
+    This is used by fields that build expensive immutable values from config
+    data, so the values can be shared between config objects. It is safe to
+    use from multiple threads.
+
+    :param int maxsize:
+        The maximum number of items to keep.
+
+    .. attribute:: hits
+
+        The number of lookups that found a cached value.
+
+    .. attribute:: misses
+
+        The number of lookups that had to build a new value.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def lookup(self, key, build_value):
+        """
+        Get the cached value for a key, building and caching it if necessary.
+
+        :param key:
+            A hashable cache key.
+        :param build_value:
+            A callable that takes no arguments and returns the value for
+            ``key``. Any exception it raises is propagated and nothing is
+            cached.
+
+        :returns:
+            The cached value.
+        """
+        with self._lock:
+            try:
+                value = self._items.pop(key)
+            except KeyError:
+                pass
+            else:
+                self.hits += 1
+                self._items[key] = value
+                return value
+        value = build_value()
+        with self._lock:
+            self.misses += 1
+            self._items[key] = value
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return value
+
+    def clear(self):
+        """
+        Discard all cached values and reset the hit and miss counters.
+        """
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Get a snapshot of cache usage.
+
+        :returns:
+            A dict containing ``hits``, ``misses``, ``size``, and ``maxsize``.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._items),
+                'maxsize': self.maxsize,
+            }
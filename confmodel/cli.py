@@ -0,0 +1,236 @@
+"""
+Command line config validator.
+
+Usage::
+
+  $ python -m confmodel myapp.config.MyConfig tenants.jsonl other.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+from importlib import import_module
+from itertools import islice
+
+from confmodel.config import Config
+
+
+def load_config_class(dotted_path):
+    """
+    Import a :class:`.Config` subclass given its dotted path.
+
+    :param str dotted_path: For example, ``'myapp.config.MyConfig'``.
+
+    :raises ValueError:
+        If the path doesn't refer to a :class:`.Config` subclass.
+    """
+    module_name, _, class_name = dotted_path.rpartition('.')
+    if not module_name:
+        raise ValueError("%r is not a dotted path." % (dotted_path,))
+    config_cls = getattr(import_module(module_name), class_name, None)
+    if not (isinstance(config_cls, type) and issubclass(config_cls, Config)):
+        raise ValueError("%r is not a Config subclass." % (dotted_path,))
+    return config_cls
+
+
+class UnreadableFile(object):
+    """
+    Stands in for the records in a file that couldn't be read or parsed, so
+    the error can be reported like an invalid record.
+    """
+
+    def __init__(self, error):
+        self.error = error
+
+
+def read_records(filenames, input_format='auto', stdin=sys.stdin):
+    """
+    Read config records from JSON or JSONL files.
+
+    JSONL input is read one line at a time, and each line is returned
+    unparsed so that parsing can happen in a worker process. A JSON file
+    contains either a single record or a list of records.
+
+    :param filenames:
+        A list of filenames, where ``'-'`` is standard input.
+    :param str input_format:
+        ``'json'``, ``'jsonl'``, or ``'auto'`` to use JSON for filenames
+        ending in ``.json`` and JSONL for everything else (including standard
+        input).
+
+    :returns:
+        An iterator of ``(location, record, is_raw)`` tuples, where
+        ``location`` describes where the record came from and ``is_raw`` is
+        ``True`` if ``record`` is an unparsed line of JSON. Files that can't
+        be read (or JSON files that can't be parsed) produce a single item
+        whose ``record`` is an :class:`UnreadableFile`.
+    """
+    for filename in filenames:
+        try:
+            f = stdin if filename == '-' else open(filename, 'rb')
+        except IOError as e:
+            yield filename, UnreadableFile(
+                "Could not read file: %s" % (e,)), False
+            continue
+        try:
+            is_json = (input_format == 'json' or (
+                input_format == 'auto' and filename.endswith('.json')))
+            if is_json:
+                try:
+                    data = json.load(f)
+                except IOError as e:
+                    yield filename, UnreadableFile(
+                        "Could not read file: %s" % (e,)), False
+                    continue
+                except ValueError as e:
+                    yield filename, UnreadableFile(
+                        "Invalid JSON: %s" % (e,)), False
+                    continue
+                if not isinstance(data, list):
+                    yield filename, data, False
+                    continue
+                for i, record in enumerate(data):
+                    yield "%s[%d]" % (filename, i), record, False
+            else:
+                try:
+                    for i, line in enumerate(f, 1):
+                        if line.strip():
+                            yield "%s:%d" % (filename, i), line, True
+                except IOError as e:
+                    yield filename, UnreadableFile(
+                        "Could not read file: %s" % (e,)), False
+        finally:
+            if f is not stdin:
+                f.close()
+
+
+# The config class and options used by validate_record() in each process.
+validator_options = {}
+
+
+def init_validator(config_path, static):
+    validator_options['config_cls'] = load_config_class(config_path)
+    validator_options['static'] = static
+
+
+def validate_record(item):
+    """
+    Validate a single record from :func:`read_records`.
+
+    :returns:
+        A ``(location, error)`` pair, where ``error`` is ``None`` if the
+        record is valid and an error message otherwise.
+    """
+    location, record, is_raw = item
+    if isinstance(record, UnreadableFile):
+        return location, record.error
+    if is_raw:
+        try:
+            record = json.loads(record)
+        except ValueError as e:
+            return location, "Invalid JSON: %s" % (e,)
+    if not isinstance(record, dict):
+        return location, "Record is not a JSON object."
+    try:
+        validator_options['config_cls'](
+            record, static=validator_options['static'])
+    except Exception as e:
+        # Invalid values can cause errors other than ConfigError (an invalid
+        # regex, for example), and they should be reported like any other.
+        return location, "%s: %s" % (type(e).__name__, e)
+    return location, None
+
+
+def validate_records(items, config_path, static=False, processes=1,
+                     chunksize=100):
+    """
+    Validate records, optionally using a pool of worker processes.
+
+    Records are handed to the workers in bounded batches, so memory use
+    doesn't grow with the number of records.
+
+    :returns:
+        An iterator of results from :func:`validate_record`, in input order.
+    """
+    if processes == 1:
+        init_validator(config_path, static)
+        for item in items:
+            yield validate_record(item)
+        return
+
+    items = iter(items)
+    pool = multiprocessing.Pool(
+        processes, init_validator, (config_path, static))
+    try:
+        batch_size = processes * chunksize * 4
+        while True:
+            batch = list(islice(items, batch_size))
+            if not batch:
+                break
+            for result in pool.imap(validate_record, batch, chunksize):
+                yield result
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def main(argv=None, stdin=sys.stdin, stdout=sys.stdout, stderr=sys.stderr):
+    """
+    Run the command line validator.
+
+    :returns:
+        An exit code: 0 if all records are valid, 1 otherwise.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m confmodel",
+        description="Validate config records against a Config subclass.")
+    parser.add_argument(
+        'config_class',
+        help="Dotted path of the Config subclass, e.g. myapp.config.MyConfig")
+    parser.add_argument(
+        'files', nargs='*', default=['-'],
+        help="JSON or JSONL files to validate, or - for standard input"
+        " (default).")
+    parser.add_argument(
+        '--format', choices=['auto', 'json', 'jsonl'], default='auto',
+        help="Input format. 'auto' uses JSON for .json files and JSONL for"
+        " everything else (default: %(default)s).")
+    parser.add_argument(
+        '--static', action='store_true',
+        help="Only validate static fields.")
+    parser.add_argument(
+        '-j', '--processes', type=int, default=multiprocessing.cpu_count(),
+        help="Number of worker processes (default: %(default)s).")
+    parser.add_argument(
+        '--chunksize', type=int, default=100,
+        help="Number of records to send to a worker at a time"
+        " (default: %(default)s).")
+    args = parser.parse_args(argv)
+
+    try:
+        load_config_class(args.config_class)
+    except (ImportError, ValueError) as e:
+        parser.error(str(e))
+
+    start = time.time()
+    total = 0
+    invalid = 0
+    items = read_records(args.files, args.format, stdin)
+    results = validate_records(
+        items, args.config_class, args.static, max(args.processes, 1),
+        args.chunksize)
+    for location, error in results:
+        total += 1
+        if error is not None:
+            invalid += 1
+            stdout.write("%s: %s\n" % (location, error))
+    elapsed = time.time() - start
+
+    rate = total / elapsed if elapsed > 0 else 0
+    stderr.write(
+        "Validated %d records in %.2fs (%.0f records/s): %d invalid.\n" % (
+            total, elapsed, rate, invalid))
+    return 1 if invalid else 0
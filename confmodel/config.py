@@ -1,8 +1,14 @@
 import inspect
 import textwrap
+from collections import deque
 
 from confmodel.errors import ConfigError
-from confmodel.interfaces import IConfigData
+from confmodel.instrumentation import instrumentation
+from confmodel.interfaces import adapt_config_data, prefetch_config_data
+
+
+# Returned by lookups when a field or fallback has no value.
+_missing = object()
 
 
 class ConfigField(object):
@@ -34,9 +40,10 @@ class ConfigField(object):
 
     Subclasses of :class:`ConfigField` are expected to override :meth:`clean`
     to convert values from the source data to the required form. :meth:`clean`
-    is called during validation and also on every attribute access, so it
-    should not perform expensive computation. (If expensive computation is
-    necessary for some reason, the result should be cached.)
+    is called during validation and also on every attribute access (unless
+    the config class sets :attr:`.Config.cache_values`), so it should not
+    perform expensive computation. (If expensive computation is necessary for
+    some reason, the result should be cached.)
 
     There are two special attributes on this descriptor:
 
@@ -88,6 +95,8 @@ class ConfigField(object):
 
     def setup(self, name):
         self.name = name
+        self._default_lookup = uses_default_methods(self, (
+            'present', 'find_value', 'find_fallback_value', 'get_value'))
 
     def present(self, config, check_fallbacks=True):
         """
@@ -124,13 +133,16 @@ class ConfigField(object):
             :class:`.Config` object containing config data.
 
         :returns:
-            ``None``, but exceptions are raised for validation failures.
+            The cleaned value, so that callers can keep it instead of cleaning
+            it again. Exceptions are raised for validation failures. Values
+            returned by overridden implementations are ignored, because older
+            implementations return ``None``.
         """
         if self.required and not self.present(config):
             raise ConfigError(
                 "Missing required config field '%s'" % (self.name,))
         # This will raise an exception if the value exists, but is invalid.
-        self.get_value(config)
+        return self.get_value(config)
 
     def raise_config_error(self, message_suffix):
         """
@@ -175,11 +187,58 @@ class ConfigField(object):
         """
         if self.present(config, check_fallbacks=False):
             return config._config_data.get(self.name, self.default)
+        if self.fallbacks and instrumentation.enabled:
+            return instrumentation.call(
+                type(config), self.name, 'fallbacks',
+                self.find_fallback_value, config)
+        return self.find_fallback_value(config)
+
+    def find_fallback_value(self, config):
+        """
+        Find a value from this field's fallbacks or default.
+
+        This is called by :meth:`find_value` if the value is not present in
+        the source data.
+
+        :param config:
+            :class:`.Config` object containing config data.
+
+        :returns:
+            The value built by the first fallback that is present, or the field
+            default if there isn't one.
+        """
         for fallback in self.fallbacks:
-            if fallback.present(config):
-                return fallback.build_value(config)
+            value = fallback.find_value(config, _missing)
+            if value is not _missing:
+                return value
         return self.default
 
+    def find_present_value(self, config, default):
+        """
+        Find a value in the source data or fallbacks, without cleaning it.
+
+        This is equivalent to calling :meth:`present` and then
+        :meth:`find_value` if a value is present, but only searches a chain of
+        fallbacks once.
+
+        :param config:
+            :class:`.Config` object containing config data.
+        :param default:
+            The value to return if no value is present. (The field default is
+            not used.)
+        """
+        if not self._default_lookup:
+            if self.present(config):
+                return self.find_value(config)
+            return default
+        if self.name in config._config_data:
+            return config._config_data.get(self.name, self.default)
+        for fallback in self.fallbacks:
+            value = fallback.find_value(config, default)
+            if value is not default:
+                return value
+        return default
+
     def get_value(self, config):
         """
         Get the cleaned value for this config field.
@@ -196,6 +255,14 @@ class ConfigField(object):
         :returns:
             A cleaned value suitable for Python code to use.
         """
+        if instrumentation.enabled:
+            config_cls = type(config)
+            value = instrumentation.call(
+                config_cls, self.name, 'find_value', self.find_value, config)
+            if value is None:
+                return None
+            return instrumentation.call(
+                config_cls, self.name, 'clean', self.clean, value)
         value = self.find_value(config)
         return self.clean(value) if value is not None else None
 
@@ -204,7 +271,14 @@ class ConfigField(object):
             return self
         if config.static and not self.static:
             self.raise_config_error("is not marked as static.")
-        return self.get_value(config)
+        if not config.cache_values:
+            return self.get_value(config)
+        try:
+            return config._value_cache[self.name]
+        except KeyError:
+            value = self.get_value(config)
+            config._value_cache[self.name] = value
+            return value
 
     def __set__(self, config, value):
         raise AttributeError("Config fields are read-only.")
@@ -212,6 +286,22 @@ class ConfigField(object):
 
 class FieldFallback(object):
     required_fields = None
+    optional_fields = ()
+
+    def get_dependencies(self):
+        """
+        Get the names of the fields this fallback refers to.
+
+        These are checked when a :class:`.Config` subclass is defined, so
+        undefined fields and circular fallbacks are found early. Subclasses
+        that override :meth:`present` or :meth:`build_value` to refer to other
+        fields should override this as well.
+
+        :returns:
+            A tuple of field names, consisting of :attr:`required_fields`
+            followed by :attr:`optional_fields`.
+        """
+        return tuple(self.required_fields or ()) + tuple(self.optional_fields)
 
     def get_field_descriptor(self, config, field_name):
         field = config._fields.get(field_name, None)
@@ -220,6 +310,37 @@ class FieldFallback(object):
                 "Undefined fallback field: '%s'" % (field_name,))
         return field
 
+    def find_field_value(self, config, field_name, default):
+        """
+        Get the value of the named field if a value is present.
+
+        This is equivalent to calling :meth:`field_present` and then reading
+        the field from the config, but only searches the field's fallbacks
+        once, so reading through long chains of fallbacks takes linear time.
+
+        :param config: :class:`.Config` instance containing config data.
+        :param str field_name: Name of the field to look up.
+        :param default: The value to return if no value is present.
+        """
+        field = self.get_field_descriptor(config, field_name)
+        if instrumentation.enabled or not field._default_lookup:
+            # Go through the usual methods so that they're recorded or can be
+            # overridden.
+            if field.present(config):
+                return getattr(config, field_name)
+            return default
+        value = field.find_present_value(config, default)
+        if value is default:
+            return default
+        if config.static and not field.static:
+            field.raise_config_error("is not marked as static.")
+        if config.cache_values:
+            try:
+                return config._value_cache[field_name]
+            except KeyError:
+                pass
+        return field.clean(value) if value is not None else None
+
     def field_present(self, config, field_name):
         """
         Check if a value for the named field is present in the config data.
@@ -247,6 +368,31 @@ class FieldFallback(object):
     def build_value(self, config):
         raise NotImplementedError("Please implement .build_value()")
 
+    def find_value(self, config, default):
+        """
+        Build the fallback value if the fallback is present.
+
+        This calls :meth:`present` and then :meth:`build_value`. Subclasses
+        may override it to do both at once, which is cheaper when the fields
+        they refer to have fallbacks of their own.
+
+        :param config: :class:`.Config` instance containing config data.
+        :param default: The value to return if the fallback isn't present.
+        """
+        if self.present(config):
+            return self.build_value(config)
+        return default
+
+    def _uses_default_methods(self, cls, method_names):
+        """
+        Check that none of the named methods are overridden in a subclass of
+        ``cls``, so an optimised :meth:`find_value` in ``cls`` can be used.
+        """
+        fallback_cls = type(self)
+        return all(
+            getattr(fallback_cls, name).__func__ is
+            getattr(cls, name).__func__ for name in method_names)
+
 
 def split_and_trim_docstring(docstring):
     lines = docstring.expandtabs().splitlines()
@@ -274,11 +420,11 @@ def split_and_trim_docstring(docstring):
     return trimmed_lines
 
 
-def generate_doc(cls, fields, header_indent='', indent=' ' * 4):
+def generate_doc(docstring, fields, header_indent='', indent=' ' * 4):
     """
-    Generate a docstring for a cls and its fields.
+    Generate a docstring for a class from its original docstring and fields.
     """
-    doc = split_and_trim_docstring(cls.__doc__ or '')
+    doc = split_and_trim_docstring(docstring or '')
     doc.append("")
     doc.append("Configuration options:")
     for field in fields:
@@ -291,16 +437,244 @@ def generate_doc(cls, fields, header_indent='', indent=' ' * 4):
     return "\n".join(doc)
 
 
+def uses_default_methods(field, method_names):
+    """
+    Check that none of the named methods are overridden by a field's class.
+    """
+    field_cls = type(field)
+    for method_name in method_names:
+        method = getattr(field_cls, method_name)
+        if method.__func__ is not getattr(ConfigField, method_name).__func__:
+            return False
+    return True
+
+
+def uses_default_lookup(field):
+    """
+    Check if a field finds its value the same way as :class:`ConfigField`.
+
+    Such fields can be validated by :class:`Config` without going through
+    :meth:`ConfigField.validate` and the methods it calls.
+    """
+    if field.fallbacks:
+        return False
+    return uses_default_methods(
+        field, ('validate', 'present', 'find_value', 'get_value'))
+
+
+def uses_default_validate(field):
+    """
+    Check if a field uses :meth:`ConfigField.validate`, and therefore returns
+    the cleaned value from it.
+    """
+    return type(field).validate.__func__ is ConfigField.validate.__func__
+
+
+def raw_values_equal(value1, value2):
+    """
+    Check if two values from config data are the same.
+
+    Values of different types are never the same, even if they compare equal,
+    because they may be cleaned differently (``True`` and ``1``, for example).
+    """
+    return value1 is value2 or (
+        type(value1) is type(value2) and value1 == value2)
+
+
+def find_changed_keys(old_data, new_data, keys):
+    """
+    Compare two sets of config data.
+
+    :param old_data: An :class:`.IConfigData` provider.
+    :param new_data: Another :class:`.IConfigData` provider.
+    :param keys: The keys to compare.
+
+    :returns:
+        A set of the keys that are present in only one of the providers, or
+        have different values in each.
+    """
+    changed = set()
+    for key in keys:
+        present = key in old_data
+        if present != (key in new_data):
+            changed.add(key)
+        elif present and not raw_values_equal(
+                old_data.get(key, None), new_data.get(key, None)):
+            changed.add(key)
+    return changed
+
+
+def build_validation_plan(fields):
+    """
+    Build a sequence of ``(field, simple)`` pairs for :class:`Config` to
+    validate, where ``simple`` is the result of :func:`uses_default_lookup`.
+    """
+    return tuple((field, uses_default_lookup(field)) for field in fields)
+
+
+def find_field_dependencies(fields):
+    """
+    Find the fields that each field refers to through its fallbacks.
+
+    :param dict fields: Mapping of field names to fields.
+
+    :returns:
+        A dict mapping each field name to a tuple of the names of the fields
+        it depends on.
+    """
+    dependencies = {}
+    for name, field in fields.items():
+        field_dependencies = []
+        for fallback in field.fallbacks:
+            for dependency in fallback.get_dependencies():
+                if dependency not in fields:
+                    raise ConfigError(
+                        "Undefined fallback field: '%s' (for field '%s')" % (
+                            dependency, name))
+                if dependency not in field_dependencies:
+                    field_dependencies.append(dependency)
+        dependencies[name] = tuple(field_dependencies)
+    return dependencies
+
+
+def find_field_dependents(dependencies):
+    """
+    Invert the result of :func:`find_field_dependencies`, following indirect
+    dependencies as well.
+
+    :returns:
+        A dict mapping each field name to a frozenset of the names of the
+        fields that depend on it, directly or indirectly.
+    """
+    direct_dependents = dict((name, set()) for name in dependencies)
+    for name, field_dependencies in dependencies.items():
+        for dependency in field_dependencies:
+            direct_dependents[dependency].add(name)
+    dependents = {}
+    for name in dependencies:
+        found = set()
+        to_check = list(direct_dependents[name])
+        while to_check:
+            dependent = to_check.pop()
+            if dependent not in found:
+                found.add(dependent)
+                to_check.extend(direct_dependents[dependent])
+        dependents[name] = frozenset(found)
+    return dependents
+
+
+def sort_fields_by_dependencies(fields, dependencies):
+    """
+    Sort fields so that each field comes after the fields it depends on.
+
+    Fields are otherwise kept in the order they're given in. A
+    :exc:`.ConfigError` is raised if there are circular fallbacks.
+
+    :param list fields: Fields in definition order.
+    :param dict dependencies: The result of :func:`find_field_dependencies`.
+
+    :returns:
+        A list of fields.
+    """
+    fields_by_name = dict((f.name, f) for f in fields)
+    sorted_fields = []
+    done = set()
+
+    def visit(field, path):
+        if field.name in done:
+            return
+        if field.name in path:
+            cycle = path[path.index(field.name):] + [field.name]
+            raise ConfigError("Circular fallback fields: %s" % (
+                " -> ".join("'%s'" % (name,) for name in cycle),))
+        for dependency in dependencies[field.name]:
+            visit(fields_by_name[dependency], path + [field.name])
+        done.add(field.name)
+        sorted_fields.append(field)
+
+    for field in fields:
+        visit(field, [])
+    return sorted_fields
+
+
+def find_data_keys(fields, dependencies):
+    """
+    Find the config data keys needed to validate and read some fields.
+
+    :param list fields: The fields to find keys for.
+    :param dict dependencies: The result of :func:`find_field_dependencies`.
+
+    :returns:
+        A tuple of the names of the given fields and all the fields they fall
+        back to, directly or indirectly.
+    """
+    keys = []
+    seen = set()
+    to_check = deque(field.name for field in fields)
+    while to_check:
+        name = to_check.popleft()
+        if name not in seen:
+            seen.add(name)
+            keys.append(name)
+            to_check.extend(dependencies[name])
+    return tuple(keys)
+
+
+class ConfigDocstring(object):
+    """
+    Descriptor for the generated ``__doc__`` of a :class:`Config` subclass.
+
+    Documentation is only needed for introspection and Sphinx, so it is
+    generated when it's first read rather than when the class is defined.
+    """
+
+    def __init__(self, docstring, fields):
+        self.docstring = docstring
+        self.fields = fields
+        self.generated_doc = None
+
+    def __get__(self, obj, cls):
+        if self.generated_doc is None:
+            self.generated_doc = generate_doc(self.docstring, self.fields)
+        return self.generated_doc
+
+
+def find_field_names(bases, class_dict):
+    """
+    Find the names of all config fields on a new class or its bases.
+
+    Bases that are :class:`Config` subclasses already know their fields, so
+    only other bases (such as mixins) need to be searched.
+    """
+    field_names = set()
+    for base in bases:
+        if isinstance(base, ConfigMetaClass):
+            field_names.update(base._field_names)
+            continue
+        for klass in inspect.getmro(base):
+            for key, value in vars(klass).items():
+                if isinstance(value, ConfigField):
+                    field_names.add(key)
+    for key, value in class_dict.items():
+        if isinstance(value, ConfigField):
+            field_names.add(key)
+    return field_names
+
+
 class ConfigMetaClass(type):
     def __new__(mcs, name, bases, class_dict):
         # locate Field instances
         fields = []
-        unified_class_dict = {}
-        for base in bases:
-            unified_class_dict.update(inspect.getmembers(base))
-        unified_class_dict.update(class_dict)
-
-        for key, possible_field in unified_class_dict.items():
+        for key in find_field_names(bases, class_dict):
+            # The class dict takes precedence over the bases, and later bases
+            # take precedence over earlier ones. A field may be replaced by
+            # something that isn't a field.
+            if key in class_dict:
+                possible_field = class_dict[key]
+            else:
+                possible_field = None
+                for base in bases:
+                    possible_field = getattr(base, key, possible_field)
             if isinstance(possible_field, ConfigField):
                 fields.append(possible_field)
                 possible_field.setup(key)
@@ -308,9 +682,25 @@ class ConfigMetaClass(type):
         fields.sort(key=lambda f: f.creation_order)
         class_dict['_fields'] = dict((f.name, f) for f in fields)
         class_dict['_field_names'] = tuple(f.name for f in fields)
-        cls = type.__new__(mcs, name, bases, class_dict)
-        cls.__doc__ = generate_doc(cls, fields)
-        return cls
+        # Work out everything validation needs to know about the fields here
+        # rather than on every instantiation. Fields are validated after any
+        # fields they fall back to.
+        dependencies = find_field_dependencies(class_dict['_fields'])
+        class_dict['_field_dependencies'] = dependencies
+        class_dict['_field_dependents'] = find_field_dependents(dependencies)
+        validation_order = sort_fields_by_dependencies(fields, dependencies)
+        class_dict['_validation_plan'] = build_validation_plan(
+            validation_order)
+        static_fields = [f for f in validation_order if f.static]
+        class_dict['_static_validation_plan'] = build_validation_plan(
+            static_fields)
+        class_dict['_data_keys'] = find_data_keys(
+            validation_order, dependencies)
+        class_dict['_static_data_keys'] = find_data_keys(
+            static_fields, dependencies)
+        class_dict['__doc__'] = ConfigDocstring(
+            class_dict.get('__doc__'), fields)
+        return type.__new__(mcs, name, bases, class_dict)
 
 
 class Config(object):
@@ -320,20 +710,251 @@ class Config(object):
 
     __metaclass__ = ConfigMetaClass
 
+    #: Set this to ``True`` in a subclass to keep each cleaned field value on
+    #: the instance, so that reads don't need to find and clean it again.
+    #: Values computed during validation are stored immediately (except for
+    #: fields that override :meth:`ConfigField.validate`, which are stored
+    #: when first read). Cached values are shared between reads, so mutable
+    #: values (such as those from :class:`.ConfigDict`) must not be modified
+    #: by the caller.
+    cache_values = False
+
     def __init__(self, config_data, static=False):
-        self._config_data = IConfigData(config_data)
+        # Providers that support it are asked for everything we need at once.
+        self._config_data = prefetch_config_data(
+            adapt_config_data(config_data), self.get_data_keys(static))
         self.static = static
-        for field in self._get_fields():
-            if self.static and not field.static:
-                # Skip non-static fields on static configs.
+        self._value_cache = {}
+        self._validate_fields(self._get_validation_plan())
+        self._run_post_validate()
+
+    @classmethod
+    def from_validated_data(cls, config_data, static=False):
+        """
+        Create a config object without validating the config data.
+
+        Field values are only found and cleaned when they are read, and
+        :meth:`post_validate` is not called. This must only be used for
+        config data that is known to be valid for this class, such as a
+        snapshot written by :func:`~confmodel.snapshot.write_snapshot`.
+
+        :param config_data:
+            The config data.
+        :param bool static:
+            If ``True``, only static fields may be read.
+        """
+        config = cls.__new__(cls)
+        config._config_data = prefetch_config_data(
+            adapt_config_data(config_data), cls.get_data_keys(static))
+        config.static = static
+        config._value_cache = {}
+        return config
+
+    def _get_validation_plan(self):
+        if self.static:
+            # Skip non-static fields on static configs.
+            return self._static_validation_plan
+        return self._validation_plan
+
+    def _run_post_validate(self):
+        if instrumentation.enabled:
+            instrumentation.call(
+                type(self), None, 'post_validate', self.post_validate)
+        else:
+            self.post_validate()
+
+    def _validate_fields(self, validation_plan):
+        config_data = self._config_data
+        cache_values = self.cache_values
+        # Instrumentation is recorded in methods that the simple validation
+        # path avoids calling.
+        instrumented = instrumentation.enabled
+        for field, simple in validation_plan:
+            if instrumented or not simple:
+                value = field.validate(self)
+                if cache_values and not uses_default_validate(field):
+                    # The value returned by an overridden validate() can't be
+                    # trusted, so it's found and cached when first read.
+                    continue
+            else:
+                # This is equivalent to field.validate(self), but avoids
+                # several method calls per field.
+                if field.name in config_data:
+                    value = config_data.get(field.name, field.default)
+                elif field.required:
+                    raise ConfigError(
+                        "Missing required config field '%s'" % (field.name,))
+                else:
+                    value = field.default
+                if value is not None:
+                    value = field.clean(value)
+            if cache_values:
+                self._value_cache[field.name] = value
+
+    def reload(self, config_data):
+        """
+        Replace the config data, only revalidating fields that are affected.
+
+        Fields are affected if their values in the config data have changed,
+        or if they fall back to affected fields. :meth:`post_validate` is
+        called again if any fields are affected. If validation fails, the
+        previous config data is restored and the :exc:`.ConfigError` is
+        raised.
+
+        This modifies the config object in place, so it should not be used
+        while other threads are reading from it.
+
+        :param config_data:
+            The new config data.
+
+        :returns:
+            A frozenset of the names of the affected fields.
+        """
+        new_data = prefetch_config_data(
+            adapt_config_data(config_data), self.get_data_keys(self.static))
+        affected = self._find_affected_fields(
+            self._config_data, new_data, self.static)
+        validation_plan = [
+            (field, simple) for field, simple in self._get_validation_plan()
+            if field.name in affected]
+        if not validation_plan:
+            self._config_data = new_data
+            return frozenset()
+
+        old_data, old_value_cache = self._config_data, self._value_cache
+        self._config_data = new_data
+        self._value_cache = dict(
+            (name, value) for name, value in old_value_cache.items()
+            if name not in affected)
+        try:
+            self._validate_fields(validation_plan)
+            self._run_post_validate()
+        except Exception:
+            self._config_data = old_data
+            self._value_cache = old_value_cache
+            raise
+        return frozenset(field.name for field, _ in validation_plan)
+
+    def diff(self, other):
+        """
+        Compare the field values of this config with those of another.
+
+        Only fields whose values in the config data differ (or that fall back
+        to such fields) are read and compared, so unchanged fields are never
+        cleaned. If either config is static, only static fields are compared.
+
+        :param other:
+            Another instance of the same config class.
+
+        :returns:
+            A dict mapping the name of each field with a different value to an
+            ``(old_value, new_value)`` pair, where ``old_value`` is the value
+            from this config and ``new_value`` is the value from ``other``.
+        """
+        if type(other) is not type(self):
+            raise TypeError("Can't compare %s with %s." % (
+                type(self).__name__, type(other).__name__))
+        static = self.static or other.static
+        affected = self._find_affected_fields(
+            self._config_data, other._config_data, static)
+        validation_plan = (
+            self._static_validation_plan if static else self._validation_plan)
+        changes = {}
+        for field, _ in validation_plan:
+            if field.name not in affected:
                 continue
-            field.validate(self)
-        self.post_validate()
+            old_value = getattr(self, field.name)
+            new_value = getattr(other, field.name)
+            if old_value != new_value:
+                changes[field.name] = (old_value, new_value)
+        return changes
+
+    @classmethod
+    def _find_affected_fields(cls, old_data, new_data, static=False):
+        """
+        Find the fields whose values may differ between two sets of config
+        data, because their own values or those of fields they fall back to
+        have changed.
+        """
+        affected = set()
+        for name in find_changed_keys(
+                old_data, new_data, cls.get_data_keys(static)):
+            affected.add(name)
+            affected.update(cls._field_dependents[name])
+        return affected
+
+    @classmethod
+    def get_data_keys(cls, static=False):
+        """
+        Get the names of all the config data keys this class reads.
+
+        This includes the fields that are validated and all the fields they
+        fall back to. It can be used to fetch config data asynchronously
+        before creating a config object, since construction from a ``dict``
+        does no I/O. See :ref:`async-loading-docs`.
+
+        :param bool static:
+            If ``True``, only include the keys needed for a static config.
+
+        :returns:
+            A tuple of field names.
+        """
+        return cls._static_data_keys if static else cls._data_keys
+
+    @classmethod
+    def validate_many(cls, config_data_iter, static=False):
+        """
+        Validate many sets of config data against this config class.
+
+        Items are processed lazily as the result is iterated over, so
+        ``config_data_iter`` may be a generator of any length.
+
+        :param config_data_iter:
+            An iterable of config data providers.
+        :param bool static:
+            Passed to the constructor for each item.
+
+        :returns:
+            An iterator of ``(config, error)`` pairs, one for each item. If an
+            item is valid, ``config`` is a new instance of this class and
+            ``error`` is ``None``. Otherwise ``config`` is ``None`` and
+            ``error`` is the exception that was raised. This is usually a
+            :exc:`.ConfigError`, but invalid values can cause other errors (a
+            :exc:`re.error` for an invalid regex, for example), and items that
+            aren't config data providers cause a :exc:`TypeError`.
+        """
+        for config_data in config_data_iter:
+            try:
+                config = cls(config_data, static=static)
+            except Exception as e:
+                yield None, e
+            else:
+                yield config, None
 
     @classmethod
     def _get_fields(cls):
         return [cls._fields[field_name] for field_name in cls._field_names]
 
+    def invalidate_cache(self, *field_names):
+        """
+        Discard cached field values.
+
+        This only has an effect if :attr:`cache_values` is set, and must be
+        called if the underlying config data is modified after the config
+        object is created.
+
+        :param field_names:
+            Names of the fields to discard cached values for. Values for
+            fields that fall back to these fields are discarded as well. If no
+            names are given, all cached values are discarded.
+        """
+        if not field_names:
+            self._value_cache.clear()
+        for field_name in field_names:
+            self._value_cache.pop(field_name, None)
+            for dependent in self._field_dependents.get(field_name, ()):
+                self._value_cache.pop(dependent, None)
+
     def raise_config_error(self, message):
         """
         Raise a :exc:`.ConfigError` with the given message.
@@ -9,6 +9,13 @@ class SingleFieldFallback(FieldFallback):
     def build_value(self, config):
         return getattr(config, self.field_name)
 
+    def find_value(self, config, default):
+        if not self._uses_default_methods(
+                SingleFieldFallback, ('present', 'build_value')):
+            return super(SingleFieldFallback, self).find_value(
+                config, default)
+        return self.find_field_value(config, self.field_name, default)
+
 
 class FormatStringFieldFallback(FieldFallback):
     def __init__(self, format_string, required_fields, optional_fields=()):
@@ -23,3 +30,18 @@ class FormatStringFieldFallback(FieldFallback):
         for field_name in self.optional_fields:
             field_values[field_name] = getattr(config, field_name)
         return self.format_string.format(**field_values)
+
+    def find_value(self, config, default):
+        if not self._uses_default_methods(
+                FormatStringFieldFallback, ('present', 'build_value')):
+            return super(FormatStringFieldFallback, self).find_value(
+                config, default)
+        field_values = {}
+        for field_name in self.required_fields:
+            value = self.find_field_value(config, field_name, default)
+            if value is default:
+                return default
+            field_values[field_name] = value
+        for field_name in self.optional_fields:
+            field_values[field_name] = getattr(config, field_name)
+        return self.format_string.format(**field_values)
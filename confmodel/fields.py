@@ -2,7 +2,10 @@ from copy import deepcopy
 from urllib2 import urlparse
 import re
 
+from confmodel.cache import LRUCache
 from confmodel.config import ConfigField
+from confmodel.providers import JSONArrayView, JSONObjectView
+from confmodel.views import FrozenDict, FrozenList
 
 
 class ConfigText(ConfigField):
@@ -49,40 +52,93 @@ class ConfigBool(ConfigField):
 
 
 class ConfigList(ConfigField):
+    """
+    A list field.
+
+    By default, each read returns a deep copy of the list in the config data.
+    If the ``frozen`` keyword argument is ``True``, each read instead returns
+    a read-only :class:`~confmodel.views.FrozenList` view of the config data
+    without copying it. The view's ``copy()`` method returns a mutable copy.
+    Lazily parsed :class:`~confmodel.providers.JSONArrayView` values are
+    returned unchanged.
+    """
     field_type = 'list'
 
+    def __init__(self, *args, **kw):
+        self.frozen = kw.pop('frozen', False)
+        super(ConfigList, self).__init__(*args, **kw)
+
     def clean(self, value):
-        if isinstance(value, tuple):
-            value = list(value)
-        if not isinstance(value, list):
+        if isinstance(value, JSONArrayView):
+            # This is already read-only, and parses its items lazily.
+            return value if self.frozen else value.copy()
+        if not isinstance(value, (list, tuple)):
             self.raise_config_error("is not a list.")
-        return deepcopy(value)
+        if self.frozen:
+            return FrozenList(value)
+        return deepcopy(list(value))
 
 
 class ConfigDict(ConfigField):
+    """
+    A dict field.
+
+    By default, each read returns a deep copy of the dict in the config data.
+    If the ``frozen`` keyword argument is ``True``, each read instead returns
+    a read-only :class:`~confmodel.views.FrozenDict` view of the config data
+    without copying it. The view's ``copy()`` method returns a mutable copy.
+    Lazily parsed :class:`~confmodel.providers.JSONObjectView` values are
+    returned unchanged.
+    """
     field_type = 'dict'
 
+    def __init__(self, *args, **kw):
+        self.frozen = kw.pop('frozen', False)
+        super(ConfigDict, self).__init__(*args, **kw)
+
     def clean(self, value):
+        if isinstance(value, JSONObjectView):
+            # This is already read-only, and parses its values lazily.
+            return value if self.frozen else value.copy()
         if not isinstance(value, dict):
             self.raise_config_error("is not a dict.")
+        if self.frozen:
+            return FrozenDict(value)
         return deepcopy(value)
 
 
+def parse_url(value):
+    # URLs must be bytes, not unicode.
+    if isinstance(value, unicode):
+        value = value.encode('utf-8')
+    return urlparse.urlparse(value)
+
+
 class ConfigUrl(ConfigField):
     field_type = 'URL'
 
+    #: Parsed URLs are immutable ``ParseResult`` tuples, so they are shared
+    #: between all URL fields.
+    url_cache = LRUCache(maxsize=512)
+
     def clean(self, value):
         if not isinstance(value, basestring):
             self.raise_config_error("is not a URL string.")
-        # URLs must be bytes, not unicode.
-        if isinstance(value, unicode):
-            value = value.encode('utf-8')
-        return urlparse.urlparse(value)
+        return self.url_cache.lookup(
+            (type(value), value), lambda: parse_url(value))
 
 
 class ConfigRegex(ConfigText):
     field_type = 'regex'
 
+    #: Compiled patterns are shared between all regex fields. This is a
+    #: :class:`~confmodel.cache.LRUCache`, so its ``stats()`` can be used to
+    #: check whether it is big enough.
+    pattern_cache = LRUCache(maxsize=512)
+
     def clean(self, value):
         value = super(ConfigRegex, self).clean(value)
-        return re.compile(value)
+        # Patterns are keyed by type as well, because a unicode pattern and an
+        # equal bytestring pattern compile to different regexes.
+        return self.pattern_cache.lookup(
+            (type(value), value), lambda: re.compile(value))
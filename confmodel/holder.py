@@ -0,0 +1,71 @@
+from threading import Lock
+
+
+class ConfigHolder(object):
+    """
+    Holds the current config object for a long-running, threaded process.
+
+    Readers use :attr:`config` to get the current config object. Writers
+    create and validate a complete new config object before publishing it, so
+    publishing is a single reference assignment and readers never take a lock
+    or see a partly validated config. A reader that needs several values to be
+    consistent with each other should read them all from the same config
+    object rather than from :attr:`config` each time::
+
+        config = holder.config
+        connect(config.host, config.port)
+
+    Published config objects are shared between threads, so they must not be
+    modified (by calling :meth:`.Config.reload`, for example).
+
+    :param config:
+        The initial :class:`.Config` object.
+    """
+
+    def __init__(self, config):
+        self._config = config
+        self._write_lock = Lock()
+
+    @property
+    def config(self):
+        """
+        The current config object.
+        """
+        return self._config
+
+    def publish(self, config):
+        """
+        Replace the current config object.
+
+        :param config:
+            A new :class:`.Config` object.
+
+        :returns:
+            The config object that was replaced.
+        """
+        with self._write_lock:
+            old_config, self._config = self._config, config
+        return old_config
+
+    def reload(self, config_data):
+        """
+        Create a new config object and publish it if it is valid.
+
+        The new config object is an instance of the same class as the current
+        one, with the same ``static`` flag. If validation fails, the
+        :exc:`.ConfigError` is raised and the current config object is kept.
+
+        Only one reload runs at a time, so reloads from several threads are
+        published in the order they were validated.
+
+        :param config_data:
+            The new config data.
+
+        :returns:
+            The new config object.
+        """
+        with self._write_lock:
+            old_config = self._config
+            config = type(old_config)(config_data, static=old_config.static)
+            self._config = config
+        return config
@@ -0,0 +1,125 @@
+from threading import Lock
+from timeit import default_timer
+
+
+class Instrumentation(object):
+    """
+    Call counts and timings for config field lookups.
+
+    When enabled, :class:`.ConfigField` records each call to
+    :meth:`~.ConfigField.find_value`, each search of its fallbacks, and each
+    call to :meth:`~.ConfigField.clean`, and :class:`.Config` records each
+    call to :meth:`~.Config.post_validate`. When disabled (the default),
+    nothing is timed or recorded.
+
+    Values read from a config with :attr:`~.Config.cache_values` set are only
+    recorded when they are first computed, so fields that show up with many
+    calls are the ones being found and cleaned repeatedly.
+
+    The module-level :data:`instrumentation` instance is the one used by
+    confmodel.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._stats = {}
+        self._lock = Lock()
+
+    def enable(self):
+        """
+        Start recording.
+        """
+        self.enabled = True
+
+    def disable(self):
+        """
+        Stop recording. Data that has already been recorded is kept.
+        """
+        self.enabled = False
+
+    def reset(self):
+        """
+        Discard all recorded data.
+        """
+        with self._lock:
+            self._stats = {}
+
+    def record(self, config_cls, field_name, operation, elapsed):
+        """
+        Record a single call.
+
+        :param config_cls:
+            The :class:`.Config` subclass the call was made for.
+        :param str field_name:
+            The name of the field the call was made for, or ``None`` for calls
+            that don't belong to a field.
+        :param str operation:
+            The kind of call, such as ``'clean'``.
+        :param float elapsed:
+            The time the call took, in seconds.
+        """
+        config_name = "%s.%s" % (config_cls.__module__, config_cls.__name__)
+        with self._lock:
+            config_stats = self._stats.setdefault(
+                config_name, {'fields': {}})
+            if field_name is None:
+                stats = config_stats
+            else:
+                stats = config_stats['fields'].setdefault(field_name, {})
+            op_stats = stats.setdefault(operation, {'calls': 0, 'time': 0.0})
+            op_stats['calls'] += 1
+            op_stats['time'] += elapsed
+
+    def call(self, config_cls, field_name, operation, func, *args):
+        """
+        Call a function and record how long it took.
+
+        See :meth:`record` for a description of the parameters.
+
+        :returns:
+            The result of ``func(*args)``.
+        """
+        start = default_timer()
+        try:
+            return func(*args)
+        finally:
+            self.record(
+                config_cls, field_name, operation, default_timer() - start)
+
+    def snapshot(self):
+        """
+        Get a copy of all recorded data.
+
+        :returns:
+            A dict mapping config class names (including the module name) to
+            dicts. Each of these contains a ``'fields'`` dict mapping field
+            names to per-operation stats, and ``'post_validate'`` stats if it
+            was called. Per-operation stats are dicts containing ``'calls'``
+            (the number of calls) and ``'time'`` (the total time taken, in
+            seconds). For example::
+
+                {'myapp.MyConfig': {
+                    'fields': {
+                        'foo': {
+                            'find_value': {'calls': 2, 'time': 0.0001},
+                            'clean': {'calls': 2, 'time': 0.0002},
+                        },
+                    },
+                    'post_validate': {'calls': 1, 'time': 0.0001},
+                }}
+        """
+        with self._lock:
+            snapshot = {}
+            for config_name, config_stats in self._stats.items():
+                snapshot[config_name] = copy_stats(config_stats)
+            return snapshot
+
+
+def copy_stats(stats):
+    return dict(
+        (key, copy_stats(value) if isinstance(value, dict) else value)
+        for key, value in stats.items())
+
+
+#: The :class:`Instrumentation` instance used by confmodel.
+instrumentation = Instrumentation()
@@ -1,4 +1,11 @@
-from zope.interface import Interface, classImplements
+try:
+    from zope.interface import Interface, classImplements
+    zope_interface_available = True
+except ImportError:
+    # zope.interface is optional. Without it, IConfigData is a plain class that
+    # only documents the protocol, and config data is checked structurally.
+    Interface = object
+    zope_interface_available = False
 
 
 class IConfigData(Interface):
@@ -7,6 +14,14 @@ class IConfigData(Interface):
 
     This provides read-only access to some configuration data provider. The
     simplest implementation is a vanilla ``dict``.
+
+    If ``zope.interface`` is installed, this is a zope interface. Otherwise, it
+    is a plain class that documents the protocol, and any object with ``get``
+    and ``__contains__`` methods is accepted as a config data provider.
+
+    Providers for which each lookup is expensive (such as those backed by a
+    remote store) may also have a ``get_many`` method, which is not part of
+    the interface. See :func:`prefetch_config_data` for details.
     """
 
     def get(field_name, default):
@@ -43,5 +58,80 @@ class IConfigData(Interface):
         """
 
 
+# Types registered with register_config_data_type(). Instances of exactly
+# these types are used as config data without going through adaptation.
+config_data_types = set()
+
+
+def register_config_data_type(cls):
+    """
+    Declare that a class implements :class:`IConfigData`.
+
+    Instances of this exact class (but not subclasses) are then used as config
+    data directly, which is faster than looking up an adapter for them. This
+    may be used as a class decorator.
+
+    :param cls: A class that implements :class:`IConfigData`.
+
+    :returns: ``cls``
+    """
+    if zope_interface_available:
+        classImplements(cls, IConfigData)
+    config_data_types.add(cls)
+    return cls
+
+
+def adapt_config_data(config_data):
+    """
+    Get an :class:`IConfigData` provider for some config data.
+
+    :param config_data:
+        An object that provides or can be adapted to :class:`IConfigData`.
+
+    :returns:
+        ``config_data`` itself if its type has been registered with
+        :func:`register_config_data_type`. Otherwise, the result of adapting it
+        to :class:`IConfigData` if that's possible, or ``config_data`` itself
+        if it has the methods confmodel uses (``get`` and ``__contains__``).
+
+    :raises TypeError:
+        If ``config_data`` isn't a config data provider.
+    """
+    if type(config_data) in config_data_types:
+        return config_data
+    if zope_interface_available:
+        adapted = IConfigData(config_data, None)
+        if adapted is not None:
+            return adapted
+    if hasattr(config_data, 'get') and hasattr(config_data, '__contains__'):
+        return config_data
+    raise TypeError(
+        "Could not adapt %r to a config data provider." % (config_data,))
+
+
+def prefetch_config_data(config_data, field_names):
+    """
+    Fetch all the config data that will be needed in a single request.
+
+    If ``config_data`` has a ``get_many`` method, it is called with the
+    sequence of field names and must return a new config data provider (such
+    as a ``dict``) containing the values of all the fields that exist. Fields
+    that don't exist must be left out of the result.
+
+    :param config_data:
+        An :class:`IConfigData` provider.
+    :param field_names:
+        The names of all the fields that will be read from the config data.
+
+    :returns:
+        The result of ``get_many`` if ``config_data`` has that method,
+        otherwise ``config_data`` itself.
+    """
+    get_many = getattr(config_data, 'get_many', None)
+    if get_many is None:
+        return config_data
+    return get_many(field_names)
+
+
 # IConfigData is implemented by dict without any changes.
-classImplements(dict, IConfigData)
+register_config_data_type(dict)
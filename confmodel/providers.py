@@ -0,0 +1,473 @@
+import json
+import mmap
+import re
+from collections import Mapping, Sequence
+from itertools import izip
+
+from confmodel.interfaces import register_config_data_type
+from confmodel.views import FrozenList
+
+
+# Matches JSON strings and the punctuation that delimits values. Everything
+# else (numbers, literals, whitespace) is skipped by the regex engine.
+JSON_TOKEN_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\],:]')
+
+# Matches everything up to and including the next bracket that isn't inside a
+# string. This is used to skip over nested values quickly. Each repetition
+# must start with a quote, so a missing bracket fails in linear time rather
+# than backtracking through every way of splitting up the text.
+JSON_BRACKET_RE = re.compile(
+    r'[^"{}\[\]]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"{}\[\]]*)*[{}\[\]]')
+
+
+# Matches the first character of a JSON value.
+JSON_VALUE_START_RE = re.compile(r'\s*(\S)')
+
+
+def skip_nested_json(data, pos, endpos=None):
+    """
+    Find the end of a nested JSON array or object.
+
+    :param data: A bytestring or buffer containing JSON.
+    :param int pos: The offset just after the opening bracket.
+    :param int endpos: The offset to stop searching at, if not the end.
+
+    :returns: The offset just after the matching closing bracket.
+    """
+    if endpos is None:
+        endpos = len(data)
+    depth = 1
+    while depth:
+        match = JSON_BRACKET_RE.match(data, pos, endpos)
+        if match is None:
+            raise ValueError(
+                "Config data contains an incomplete JSON object.")
+        pos = match.end()
+        depth += 1 if data[pos - 1] in '{[' else -1
+    return pos
+
+
+def find_json_start(data, pos, endpos, bracket):
+    first = JSON_TOKEN_RE.search(data, pos, endpos)
+    if (first is None or first.group() != bracket or
+            data[pos:first.start()].strip()):
+        kind = 'object' if bracket == '{' else 'array'
+        raise ValueError("Config data does not contain a JSON %s." % (kind,))
+    return first.end()
+
+
+def index_json_object(data, pos=0, endpos=None):
+    """
+    Find the top-level keys of a JSON object and the location of each value.
+
+    Nested values are skipped over without being parsed.
+
+    :param data:
+        A bytestring or buffer (such as an ``mmap``) containing a JSON object.
+    :param int pos:
+        The offset of the object in ``data``.
+    :param int endpos:
+        The offset of the end of the object, if not the end of ``data``.
+
+    :returns:
+        A dict mapping each key to a ``(start, end)`` pair of offsets of its
+        value in ``data``.
+
+    :raises ValueError:
+        If ``data`` doesn't contain a JSON object.
+    """
+    if endpos is None:
+        endpos = len(data)
+    pos = find_json_start(data, pos, endpos, '{')
+    index = {}
+    key = None
+    value_start = None
+    while True:
+        token = JSON_TOKEN_RE.search(data, pos, endpos)
+        if token is None:
+            raise ValueError(
+                "Config data contains an incomplete JSON object.")
+        text = token.group()
+        pos = token.end()
+        if text in '{[':
+            pos = skip_nested_json(data, pos, endpos)
+        elif text in ',}':
+            if key is not None:
+                index[key] = (value_start, token.start())
+                key = None
+            if text == '}':
+                return index
+        elif text == ':':
+            value_start = pos
+        elif key is None:
+            # This is a string and we're expecting a key.
+            key = json.loads(text)
+        elif text == ']':
+            raise ValueError(
+                "Config data contains an invalid JSON object.")
+
+
+def index_json_array(data, pos=0, endpos=None):
+    """
+    Find the location of each item in a JSON array.
+
+    Nested values are skipped over without being parsed.
+
+    :param data:
+        A bytestring or buffer (such as an ``mmap``) containing a JSON array.
+    :param int pos:
+        The offset of the array in ``data``.
+    :param int endpos:
+        The offset of the end of the array, if not the end of ``data``.
+
+    :returns:
+        A list of ``(start, end)`` pairs of offsets of each item in ``data``.
+
+    :raises ValueError:
+        If ``data`` doesn't contain a JSON array.
+    """
+    if endpos is None:
+        endpos = len(data)
+    pos = value_start = find_json_start(data, pos, endpos, '[')
+    index = []
+    while True:
+        token = JSON_TOKEN_RE.search(data, pos, endpos)
+        if token is None:
+            raise ValueError(
+                "Config data contains an incomplete JSON array.")
+        text = token.group()
+        pos = token.end()
+        if text in '{[':
+            pos = skip_nested_json(data, pos, endpos)
+        elif text in ',]':
+            if text == ']' and not index and (
+                    not data[value_start:token.start()].strip()):
+                # This is an empty array.
+                return index
+            index.append((value_start, token.start()))
+            if text == ']':
+                return index
+            value_start = pos
+        elif text in ':}':
+            raise ValueError(
+                "Config data contains an invalid JSON array.")
+
+
+def load_json_view(data, start, end):
+    """
+    Parse a JSON value, wrapping objects and arrays in lazy views.
+
+    :param data: A bytestring or buffer containing JSON.
+    :param int start: The offset of the value in ``data``.
+    :param int end: The offset of the end of the value.
+
+    :returns:
+        A :class:`JSONObjectView` or :class:`JSONArrayView` for objects and
+        arrays, or the parsed value for anything else.
+    """
+    match = JSON_VALUE_START_RE.match(data, start, end)
+    if match is not None:
+        if match.group(1) == '{':
+            return JSONObjectView(data, start, end)
+        if match.group(1) == '[':
+            return JSONArrayView(data, start, end)
+    return json.loads(data[start:end])
+
+
+class JSONObjectView(Mapping):
+    """
+    A read-only view of a JSON object in a buffer, such as a memory-mapped
+    file.
+
+    The object's keys are indexed the first time the view is used, and each
+    value is only parsed when it is read. Nested objects and arrays are
+    returned as views themselves (and kept, so their indexes are only built
+    once), but other values are parsed again on each read. A process that
+    reads a few items from a large object therefore never builds the whole
+    object in memory.
+
+    :param data: A bytestring or buffer containing JSON.
+    :param int start: The offset of the object in ``data``.
+    :param int end: The offset of the end of the object.
+    """
+
+    def __init__(self, data, start, end):
+        self._data = data
+        self._start = start
+        self._end = end
+        self._index = None
+        self._views = {}
+
+    def _get_index(self):
+        if self._index is None:
+            self._index = index_json_object(self._data, self._start, self._end)
+        return self._index
+
+    def __getitem__(self, key):
+        try:
+            return self._views[key]
+        except KeyError:
+            pass
+        start, end = self._get_index()[key]
+        value = load_json_view(self._data, start, end)
+        if isinstance(value, (JSONObjectView, JSONArrayView)):
+            self._views[key] = value
+        return value
+
+    def __iter__(self):
+        return iter(self._get_index())
+
+    def __len__(self):
+        return len(self._get_index())
+
+    def __contains__(self, key):
+        return key in self._get_index()
+
+    def __repr__(self):
+        return "%s(%r)" % (type(self).__name__, self.copy())
+
+    def copy(self):
+        """
+        Parse the whole object.
+
+        :returns: A new dict.
+        """
+        return json.loads(self._data[self._start:self._end])
+
+
+class JSONArrayView(Sequence):
+    """
+    A read-only view of a JSON array in a buffer, such as a memory-mapped
+    file.
+
+    Items are located the first time the view is used, and are parsed like
+    the values of a :class:`JSONObjectView`.
+
+    :param data: A bytestring or buffer containing JSON.
+    :param int start: The offset of the array in ``data``.
+    :param int end: The offset of the end of the array.
+    """
+
+    def __init__(self, data, start, end):
+        self._data = data
+        self._start = start
+        self._end = end
+        self._index = None
+        self._views = {}
+
+    def _get_index(self):
+        if self._index is None:
+            self._index = index_json_array(self._data, self._start, self._end)
+        return self._index
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return FrozenList(
+                [self[i] for i in range(*index.indices(len(self)))])
+        if index < 0:
+            index += len(self)
+        try:
+            return self._views[index]
+        except KeyError:
+            pass
+        start, end = self._get_index()[index]
+        value = load_json_view(self._data, start, end)
+        if isinstance(value, (JSONObjectView, JSONArrayView)):
+            self._views[index] = value
+        return value
+
+    def __len__(self):
+        return len(self._get_index())
+
+    def __eq__(self, other):
+        if not isinstance(other, (list, tuple, FrozenList, JSONArrayView)):
+            return NotImplemented
+        if len(self) != len(other):
+            return False
+        return all(a == b for a, b in izip(self, other))
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __repr__(self):
+        return "%s(%r)" % (type(self).__name__, self.copy())
+
+    def copy(self):
+        """
+        Parse the whole array.
+
+        :returns: A new list.
+        """
+        return json.loads(self._data[self._start:self._end])
+
+
+@register_config_data_type
+class LayeredConfigData(object):
+    """
+    Config data provider that combines several other providers.
+
+    Each key is looked up in the highest-precedence layer that contains it.
+    An index of which layer holds each key is built up front, so lookups don't
+    need to check each layer in turn.
+
+    :param layers:
+        A list of config data providers, from lowest to highest precedence
+        (for example: defaults, a site config file, per-tenant overrides). As
+        well as implementing :class:`~confmodel.interfaces.IConfigData`, each
+        layer must support iteration over its keys, as ``dict`` does.
+
+    Changes to the keys in a layer are not seen until the layer is passed to
+    :meth:`replace_layer` (which may be given the same layer object). Layers
+    should not be replaced while other threads are reading the config data.
+    """
+
+    def __init__(self, layers):
+        self._layers = []
+        self._layer_keys = []
+        self._index = {}
+        for layer in layers:
+            self._layers.append(layer)
+            self._layer_keys.append(frozenset(layer))
+        for position, keys in enumerate(self._layer_keys):
+            for key in keys:
+                self._index[key] = position
+
+    @property
+    def layers(self):
+        """
+        A tuple of the current layers, from lowest to highest precedence.
+        """
+        return tuple(self._layers)
+
+    def replace_layer(self, position, layer):
+        """
+        Replace a single layer and update the key index.
+
+        Only the keys in the old and new layers are reindexed, so this is much
+        cheaper than building a new :class:`LayeredConfigData` when the other
+        layers are large.
+
+        :param int position:
+            The position of the layer to replace in :attr:`layers`.
+        :param layer:
+            The new config data provider for this position.
+        """
+        old_keys = self._layer_keys[position]
+        new_keys = frozenset(layer)
+        self._layers[position] = layer
+        self._layer_keys[position] = new_keys
+        for key in old_keys - new_keys:
+            if self._index[key] == position:
+                self._reindex_key(key, position - 1)
+        for key in new_keys:
+            if self._index.get(key, -1) <= position:
+                self._index[key] = position
+
+    def _reindex_key(self, key, highest_position):
+        for position in range(highest_position, -1, -1):
+            if key in self._layer_keys[position]:
+                self._index[key] = position
+                return
+        del self._index[key]
+
+    def get(self, field_name, default=None):
+        position = self._index.get(field_name)
+        if position is None:
+            return default
+        return self._layers[position].get(field_name, default)
+
+    def has_key(self, field_name):
+        return field_name in self._index
+
+    def __contains__(self, field_name):
+        return field_name in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def keys(self):
+        return self._index.keys()
+
+
+@register_config_data_type
+class JSONFileConfigData(object):
+    """
+    Config data provider that reads a JSON file lazily.
+
+    The file must contain a JSON object. It is memory-mapped and its top-level
+    keys are indexed when the provider is created, but each value is only
+    parsed the first time it is requested, after which the parsed value is
+    kept. Processes that only read a few fields from a large file therefore
+    never build the rest of it in memory.
+
+    :param str filename:
+        The path of the JSON file.
+    :param nested_views:
+        If ``True``, objects and arrays are returned as read-only
+        :class:`JSONObjectView` and :class:`JSONArrayView` objects that parse
+        their contents lazily in the same way, instead of being parsed
+        completely. This may also be a collection of keys, in which case only
+        the values of those keys are returned as views. Views stop working
+        when the provider is closed. Frozen :class:`.ConfigDict` and
+        :class:`.ConfigList` fields return them unchanged.
+
+    :raises ValueError:
+        If the file doesn't contain a JSON object. Invalid JSON inside a value
+        is only detected when that value is parsed.
+    """
+
+    def __init__(self, filename, nested_views=False):
+        self.filename = filename
+        self.nested_views = nested_views
+        if isinstance(nested_views, bool):
+            self._view_keys = frozenset()
+        else:
+            self._view_keys = frozenset(nested_views)
+        with open(filename, 'rb') as f:
+            try:
+                self._data = mmap.mmap(
+                    f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files can't be mapped.
+                raise ValueError(
+                    "Config data does not contain a JSON object.")
+        self._index = index_json_object(self._data)
+        self._values = {}
+
+    def close(self):
+        """
+        Release the memory map. Values that have already been parsed are
+        still available, but nested views are not.
+        """
+        self._data.close()
+
+    def get(self, field_name, default=None):
+        try:
+            return self._values[field_name]
+        except KeyError:
+            pass
+        location = self._index.get(field_name)
+        if location is None:
+            return default
+        start, end = location
+        if self.nested_views is True or field_name in self._view_keys:
+            value = load_json_view(self._data, start, end)
+        else:
+            value = json.loads(self._data[start:end])
+        self._values[field_name] = value
+        return value
+
+    def has_key(self, field_name):
+        return field_name in self._index
+
+    def __contains__(self, field_name):
+        return field_name in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def keys(self):
+        return self._index.keys()
@@ -0,0 +1,164 @@
+import json
+import os
+import tempfile
+
+from confmodel.fields import ConfigDict, ConfigList
+from confmodel.providers import (
+    JSONArrayView, JSONFileConfigData, JSONObjectView)
+
+
+#: The key in a snapshot file that holds information about the snapshot
+#: itself, rather than config data.
+SNAPSHOT_INFO_KEY = u'__confmodel_snapshot__'
+
+
+def get_config_class_name(config_cls):
+    return u"%s.%s" % (config_cls.__module__, config_cls.__name__)
+
+
+def encode_view(value):
+    if isinstance(value, (JSONObjectView, JSONArrayView)):
+        return value.copy()
+    raise TypeError("%r is not JSON serializable" % (value,))
+
+
+def accepts_json_views(field):
+    """
+    Check if a field returns :class:`.JSONObjectView` and
+    :class:`.JSONArrayView` values unchanged, so it can be given them instead
+    of fully parsed values.
+    """
+    for field_cls in (ConfigDict, ConfigList):
+        if isinstance(field, field_cls):
+            return field.frozen and (
+                type(field).clean.__func__ is field_cls.clean.__func__)
+    return False
+
+
+def find_view_keys(config_cls):
+    """
+    Find the keys in a snapshot of ``config_cls`` that can be read through
+    lazy views. These are the names of fields that accept views and are only
+    used as fallbacks by other fields that accept them too.
+    """
+    fields = config_cls._fields
+    view_keys = []
+    for name, field in fields.items():
+        if accepts_json_views(field) and all(
+                accepts_json_views(fields[dependent])
+                for dependent in config_cls._field_dependents[name]):
+            view_keys.append(name)
+    return view_keys
+
+
+def write_snapshot(config, filename, mode=None):
+    """
+    Write the config data of a validated config object to a JSON file.
+
+    Only the keys the config reads are written, as they appear in the config
+    data (before cleaning). Attached snapshots aren't validated by default, so
+    each value must come back unchanged when read from JSON (dicts with
+    non-string keys and tuples don't, for example). The config class and the
+    ``static`` flag are recorded as well, so that :func:`attach_snapshot` can
+    check them. The file is written under a temporary name and renamed into
+    place, so processes reading the previous snapshot are unaffected and new
+    readers only ever see a complete file.
+
+    :param config:
+        A validated :class:`.Config` object.
+    :param str filename:
+        The path of the snapshot file.
+    :param int mode:
+        The permissions of the snapshot file. By default, the file is
+        readable and writable by everyone the process umask allows, as with
+        :func:`open`.
+
+    :raises ValueError:
+        If a value can't be written to JSON and read back unchanged.
+    """
+    config_data = config._config_data
+    data = {}
+    for key in config.get_data_keys(config.static):
+        if key in config_data:
+            data[key] = config_data.get(key, None)
+    data[SNAPSHOT_INFO_KEY] = {
+        u'config_class': get_config_class_name(type(config)),
+        u'static': config.static,
+    }
+    encoded = json.dumps(data, separators=(',', ':'), default=encode_view)
+    decoded = json.loads(encoded)
+    for key, value in data.items():
+        if decoded[key] != value:
+            raise ValueError(
+                "Config data for %r is changed by writing it to JSON: %r"
+                % (key, value))
+    if mode is None:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0666 & ~umask
+
+    dirname, basename = os.path.split(os.path.abspath(filename))
+    fd, tempname = tempfile.mkstemp(
+        prefix='.%s.' % (basename,), suffix='.tmp', dir=dirname)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(encoded)
+            f.flush()
+            os.fsync(f.fileno())
+        # Temporary files are only readable by their owner.
+        os.chmod(tempname, mode)
+        os.rename(tempname, filename)
+    except Exception:
+        os.remove(tempname)
+        raise
+
+
+def attach_snapshot(config_cls, filename, static=False, validate=False):
+    """
+    Create a config object from a snapshot written by :func:`write_snapshot`.
+
+    The snapshot is memory-mapped with :class:`.JSONFileConfigData`, so every
+    process that attaches to the same snapshot shares a single copy of the
+    file in the operating system's page cache. The values of frozen
+    :class:`.ConfigDict` and :class:`.ConfigList` fields are read through
+    lazy views (see the ``nested_views`` option of
+    :class:`.JSONFileConfigData`), so they only parse the items that are read
+    from them, and a worker only holds the parts of the config it uses in its
+    own memory. Other fields get fully parsed values, as they would from the
+    config data the snapshot was written from. Subclasses of these fields that
+    override ``clean()`` are not given views, because they may not expect
+    them.
+
+    :param config_cls:
+        The :class:`.Config` subclass the snapshot was written from.
+    :param str filename:
+        The path of the snapshot file.
+    :param bool static:
+        Passed to the config class.
+    :param bool validate:
+        If ``True``, validate the snapshot as usual. This parses every field
+        in each process. By default, the snapshot is trusted to be valid
+        because the config it was written from was validated (see
+        :meth:`.Config.from_validated_data`).
+
+    :raises ValueError:
+        If the file isn't a snapshot of ``config_cls``, or if it is a static
+        snapshot and ``static`` is ``False`` (because the snapshot doesn't
+        contain the non-static fields).
+    """
+    config_data = JSONFileConfigData(
+        filename, nested_views=find_view_keys(config_cls))
+    info = config_data.get(SNAPSHOT_INFO_KEY, None)
+    if info is None:
+        raise ValueError("%r is not a config snapshot." % (filename,))
+    config_class_name = get_config_class_name(config_cls)
+    if info['config_class'] != config_class_name:
+        raise ValueError("%r is a snapshot of %s, not %s." % (
+            filename, info['config_class'], config_class_name))
+    if info['static'] and not static:
+        raise ValueError(
+            "%r is a static snapshot and can only be attached with"
+            " static=True." % (filename,))
+    if validate:
+        return config_cls(config_data, static=static)
+    return config_cls.from_validated_data(config_data, static=static)
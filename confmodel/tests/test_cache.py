@@ -0,0 +1,39 @@
+from unittest import TestCase
+
+from confmodel.cache import LRUCache
+
+
+class TestLRUCache(TestCase):
+    def test_lookup(self):
+        cache = LRUCache(maxsize=2)
+        self.assertEqual(cache.lookup('a', lambda: 1), 1)
+        self.assertEqual(cache.lookup('a', lambda: 2), 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_lookup_error(self):
+        cache = LRUCache(maxsize=2)
+
+        def build_value():
+            raise ValueError("Bad value.")
+
+        self.assertRaises(ValueError, cache.lookup, 'a', build_value)
+        self.assertEqual(len(cache), 0)
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.lookup('a', lambda: 1)
+        cache.lookup('b', lambda: 2)
+        cache.lookup('a', lambda: 3)
+        cache.lookup('c', lambda: 4)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.lookup('a', lambda: 5), 1)
+        self.assertEqual(cache.lookup('b', lambda: 6), 6)
+
+    def test_clear(self):
+        cache = LRUCache(maxsize=2)
+        cache.lookup('a', lambda: 1)
+        cache.lookup('a', lambda: 1)
+        cache.clear()
+        self.assertEqual(cache.stats(), {
+            'hits': 0, 'misses': 0, 'size': 0, 'maxsize': 2})
+        self.assertEqual(cache.lookup('a', lambda: 2), 2)
@@ -0,0 +1,173 @@
+import json
+import os
+import shutil
+import tempfile
+from StringIO import StringIO
+from unittest import TestCase
+
+from confmodel.cli import (
+    UnreadableFile, load_config_class, main, read_records, validate_records)
+from confmodel.config import Config
+from confmodel.fields import ConfigInt, ConfigRegex, ConfigText
+
+
+class CliConfig(Config):
+    "Config used by the command line tests."
+    name = ConfigText("name", required=True, static=True)
+    count = ConfigInt("count", required=True)
+    pattern = ConfigRegex("pattern")
+
+
+CONFIG_PATH = '%s.CliConfig' % (__name__,)
+
+
+class TestCli(TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tempdir)
+
+    def write_file(self, filename, content):
+        path = os.path.join(self.tempdir, filename)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+    def write_jsonl(self, filename, lines):
+        return self.write_file(filename, "".join(
+            (line if isinstance(line, str) else json.dumps(line)) + "\n"
+            for line in lines))
+
+    def run_main(self, args, stdin=""):
+        stdout = StringIO()
+        stderr = StringIO()
+        exit_code = main(args, StringIO(stdin), stdout, stderr)
+        return exit_code, stdout.getvalue(), stderr.getvalue()
+
+    def test_load_config_class(self):
+        self.assertEqual(load_config_class(CONFIG_PATH), CliConfig)
+        self.assertRaises(ValueError, load_config_class, 'CliConfig')
+        self.assertRaises(
+            ValueError, load_config_class, '%s.TestCli' % (__name__,))
+        self.assertRaises(
+            ValueError, load_config_class, '%s.Missing' % (__name__,))
+        self.assertRaises(ImportError, load_config_class, 'nomodule.Config')
+
+    def test_read_records_jsonl(self):
+        path = self.write_jsonl('records.jsonl', [{'a': 1}, '', {'b': 2}])
+        self.assertEqual(list(read_records([path])), [
+            ('%s:1' % (path,), '{"a": 1}\n', True),
+            ('%s:3' % (path,), '{"b": 2}\n', True),
+        ])
+
+    def test_read_records_json(self):
+        list_path = self.write_file('list.json', '[{"a": 1}, {"b": 2}]')
+        object_path = self.write_file('object.json', '{"c": 3}')
+        self.assertEqual(list(read_records([list_path, object_path])), [
+            ('%s[0]' % (list_path,), {'a': 1}, False),
+            ('%s[1]' % (list_path,), {'b': 2}, False),
+            (object_path, {'c': 3}, False),
+        ])
+
+    def test_read_records_unreadable(self):
+        missing = os.path.join(self.tempdir, 'missing.jsonl')
+        bad_json = self.write_file('bad.json', '[{"a": 1}, {"b": ')
+        good = self.write_jsonl('good.jsonl', [{'c': 3}])
+        items = list(read_records([missing, bad_json, good, self.tempdir]))
+        self.assertEqual(
+            [location for location, _, _ in items],
+            [missing, bad_json, '%s:1' % (good,), self.tempdir])
+        self.assertTrue(isinstance(items[0][1], UnreadableFile))
+        self.assertTrue(
+            items[0][1].error.startswith("Could not read file: "))
+        self.assertTrue(isinstance(items[1][1], UnreadableFile))
+        self.assertTrue(items[1][1].error.startswith("Invalid JSON: "))
+        self.assertTrue(isinstance(items[3][1], UnreadableFile))
+
+    def test_read_records_stdin(self):
+        stdin = StringIO('{"a": 1}\n')
+        self.assertEqual(list(read_records(['-'], stdin=stdin)), [
+            ('-:1', '{"a": 1}\n', True),
+        ])
+        stdin = StringIO('[{"a": 1}]')
+        self.assertEqual(list(read_records(['-'], 'json', stdin)), [
+            ('-[0]', {'a': 1}, False),
+        ])
+
+    def test_validate_records(self):
+        items = [
+            ('a', '{"name": "foo", "count": 1}', True),
+            ('b', {"name": "foo"}, False),
+            ('c', '{"name": ', True),
+            ('d', [], False),
+            ('e', {"name": "foo", "count": 1, "pattern": "("}, False),
+        ]
+        results = list(validate_records(iter(items), CONFIG_PATH))
+        self.assertEqual([location for location, _ in results], list("abcde"))
+        self.assertEqual(results[0][1], None)
+        self.assertEqual(
+            results[1][1],
+            "ConfigError: Missing required config field 'count'")
+        self.assertTrue(results[2][1].startswith("Invalid JSON: "))
+        self.assertEqual(results[3][1], "Record is not a JSON object.")
+        self.assertTrue(results[4][1].startswith("error: "))
+
+    def test_validate_records_static(self):
+        items = [('a', {"name": "foo"}, False)]
+        self.assertEqual(
+            list(validate_records(iter(items), CONFIG_PATH, static=True)),
+            [('a', None)])
+
+    def test_validate_records_processes(self):
+        items = [
+            ('%d' % (i,), {"name": "foo", "count": i % 3 or "x"}, False)
+            for i in range(50)]
+        results = list(validate_records(
+            iter(items), CONFIG_PATH, processes=2, chunksize=3))
+        self.assertEqual(
+            [location for location, _ in results],
+            [location for location, _, _ in items])
+        self.assertEqual(
+            [location for location, error in results if error],
+            ['%d' % (i,) for i in range(0, 50, 3)])
+
+    def test_main(self):
+        path = self.write_jsonl('records.jsonl', [
+            {"name": "foo", "count": 1},
+            {"name": "foo", "count": "x"},
+        ])
+        exit_code, stdout, stderr = self.run_main(
+            [CONFIG_PATH, path, '-j', '1'])
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(
+            stdout, "%s:2: ConfigError: Field 'count' could not be converted"
+            " to int.\n" % (path,))
+        self.assertTrue(stderr.startswith("Validated 2 records in "))
+        self.assertTrue(stderr.endswith(": 1 invalid.\n"))
+
+    def test_main_unreadable_files(self):
+        missing = os.path.join(self.tempdir, 'missing.jsonl')
+        bad_json = self.write_file('bad.json', '{"name": ')
+        good = self.write_jsonl('good.jsonl', [{"name": "foo", "count": 1}])
+        for processes in ['1', '2']:
+            exit_code, stdout, stderr = self.run_main(
+                [CONFIG_PATH, missing, bad_json, good, '-j', processes])
+            self.assertEqual(exit_code, 1)
+            lines = stdout.splitlines()
+            self.assertEqual(len(lines), 2)
+            self.assertTrue(
+                lines[0].startswith("%s: Could not read file: " % (missing,)))
+            self.assertTrue(
+                lines[1].startswith("%s: Invalid JSON: " % (bad_json,)))
+            self.assertTrue(stderr.startswith("Validated 3 records in "))
+            self.assertTrue(stderr.endswith(": 2 invalid.\n"))
+
+    def test_main_stdin_valid(self):
+        exit_code, stdout, stderr = self.run_main(
+            [CONFIG_PATH, '-j', '1'], '{"name": "foo", "count": 1}\n')
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(stdout, "")
+        self.assertTrue(stderr.endswith(": 0 invalid.\n"))
+
+    def test_main_bad_config_class(self):
+        self.assertRaises(
+            SystemExit, self.run_main, ['%s.TestCli' % (__name__,)])
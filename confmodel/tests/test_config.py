@@ -1,8 +1,66 @@
+import re
+import time
 from unittest import TestCase
 
 from confmodel.config import Config, ConfigField, FieldFallback
 from confmodel.errors import ConfigError
-from confmodel.fields import ConfigText, ConfigInt
+from confmodel.fallbacks import SingleFieldFallback, FormatStringFieldFallback
+from confmodel.fields import ConfigText, ConfigInt, ConfigDict, ConfigRegex
+
+
+class RemoteConfigData(object):
+    """
+    Stand-in for a config data provider backed by a remote store, where each
+    request has some latency.
+    """
+
+    def __init__(self, data, latency=0.001, batched=True):
+        self._data = data
+        self.latency = latency
+        self.requests = []
+        if batched:
+            self.get_many = self._get_many
+
+    def _request(self, request):
+        self.requests.append(request)
+        time.sleep(self.latency)
+
+    def get(self, field_name, default=None):
+        self._request(('get', field_name))
+        return self._data.get(field_name, default)
+
+    def has_key(self, field_name):
+        self._request(('has_key', field_name))
+        return field_name in self._data
+
+    def __contains__(self, field_name):
+        self._request(('contains', field_name))
+        return field_name in self._data
+
+    def _get_many(self, field_names):
+        self._request(('get_many', tuple(field_names)))
+        return dict(
+            (name, self._data[name]) for name in field_names
+            if name in self._data)
+
+
+class StrictConfigData(object):
+    """
+    Config data provider that requires every argument of
+    :meth:`IConfigData.get`, as a conforming provider may.
+    """
+
+    def __init__(self, data):
+        self._data = data
+
+    def get(self, field_name, default):
+        return self._data.get(field_name, default)
+
+    def has_key(self, field_name):
+        return field_name in self._data
+
+    def __contains__(self, field_name):
+        return field_name in self._data
 
 
 class TestConfig(TestCase):
@@ -131,6 +189,17 @@ class TestConfig(TestCase):
 
         self.assertEqual(BarConfig.__doc__, expected_doc)
 
+    def test_doc_generated_lazily(self):
+        class FooConfig(Config):
+            "Test config."
+            foo = ConfigField("A foo field.")
+
+        docstring = FooConfig.__dict__['__doc__']
+        self.assertEqual(docstring.generated_doc, None)
+        self.assertEqual(FooConfig.__doc__, docstring.generated_doc)
+        self.assertEqual(FooConfig({}).__doc__, docstring.generated_doc)
+        self.assertTrue(FooConfig.__doc__.startswith("Test config."))
+
     def test_inheritance(self):
         class FooConfig(Config):
             "Test config."
@@ -181,6 +250,43 @@ class TestConfig(TestCase):
         self.assertEqual(conf.bar, 'bleh')
         self.assertEqual(conf.baz, 'blerg')
 
+    def test_mixin_inheritance(self):
+        class FooMixin(object):
+            foo = ConfigField("From mixin.")
+
+        class BarConfig(Config):
+            "Test config."
+            bar = ConfigField("From base class.")
+
+        class BazConfig(BarConfig, FooMixin):
+            "Mixin test config."
+            baz = ConfigField("From top class.")
+
+        conf = BazConfig({'foo': 'blah', 'bar': 'bleh', 'baz': 'blerg'})
+        self.assertEqual(conf._get_fields(),
+                         [FooMixin.foo, BarConfig.bar, BazConfig.baz])
+        self.assertEqual(conf.foo, 'blah')
+
+    def test_field_overrides(self):
+        class FooConfig(Config):
+            "Test config."
+            foo = ConfigField("From base class.")
+            bar = ConfigField("From base class.")
+
+        class BarMixin(object):
+            foo = ConfigField("From mixin.")
+            bar = None
+
+        class BazConfig(FooConfig, BarMixin):
+            "Override test config."
+
+        class QuuxConfig(FooConfig):
+            "Override test config."
+            bar = None
+
+        self.assertEqual(BazConfig._get_fields(), [BarMixin.foo])
+        self.assertEqual(QuuxConfig._get_fields(), [FooConfig.foo])
+
     def test_validation(self):
         class FooConfig(Config):
             "Test config."
@@ -194,6 +300,51 @@ class TestConfig(TestCase):
         self.assertRaises(ConfigError, FooConfig, {})
         self.assertRaises(ConfigError, FooConfig, {'foo': 'blah', 'baz': 'hi'})
 
+    def test_validate_returns_cleaned_value(self):
+        class FooConfig(Config):
+            "Test config."
+            foo = ConfigInt("foo")
+
+        conf = FooConfig({'foo': '1'})
+        self.assertEqual(FooConfig.foo.validate(conf), 1)
+
+    def test_validation_plan(self):
+        class NoneField(ConfigField):
+            def get_value(self, config):
+                value = self.find_value(config)
+                return 'none' if value is None else value
+
+        class FooConfig(Config):
+            "Test config."
+            foo = ConfigInt("foo", static=True)
+            bar = NoneField("bar")
+            baz = ConfigField("baz", fallbacks=[FieldFallback()])
+
+        self.assertEqual(FooConfig._validation_plan, (
+            (FooConfig.foo, True),
+            (FooConfig.bar, False),
+            (FooConfig.baz, False),
+        ))
+        self.assertEqual(
+            FooConfig._static_validation_plan, ((FooConfig.foo, True),))
+
+    def test_validation_custom_lookup(self):
+        class RequiredField(ConfigField):
+            def get_value(self, config):
+                value = self.find_value(config)
+                if value is None:
+                    self.raise_config_error("is None.")
+                return value
+
+        class FooConfig(Config):
+            "Test config."
+            cache_values = True
+            foo = RequiredField("foo")
+
+        conf = FooConfig({'foo': 'blah'})
+        self.assertEqual(conf._value_cache, {'foo': 'blah'})
+        self.assertRaises(ConfigError, FooConfig, {})
+
     def test_static_validation(self):
         class FooConfig(Config):
             "Test config."
@@ -221,6 +372,150 @@ class TestConfig(TestCase):
 
         self.assertRaises(ConfigError, FooConfig, {'foo': -1})
 
+    def test_validate_many(self):
+        class FooConfig(Config):
+            foo = ConfigInt("foo", required=True)
+
+        results = FooConfig.validate_many([{'foo': 1}, {}, {'foo': 'x'}])
+        [(conf1, err1), (conf2, err2), (conf3, err3)] = list(results)
+        self.assertEqual((conf1.foo, err1), (1, None))
+        self.assertEqual(conf2, None)
+        self.assertEqual(
+            str(err2), "Missing required config field 'foo'")
+        self.assertEqual(conf3, None)
+        self.assertEqual(
+            str(err3), "Field 'foo' could not be converted to int.")
+
+    def test_validate_many_other_errors(self):
+        class FooConfig(Config):
+            pattern = ConfigRegex("pattern", required=True)
+
+        results = list(FooConfig.validate_many(
+            [{'pattern': 'a'}, {'pattern': '('}, None, {'pattern': 'b'}]))
+        self.assertEqual(len(results), 4)
+        [(conf1, err1), (conf2, err2), (conf3, err3), (conf4, err4)] = results
+        self.assertEqual((conf1.pattern.pattern, err1), ('a', None))
+        self.assertEqual(conf2, None)
+        self.assertTrue(isinstance(err2, re.error))
+        self.assertEqual(conf3, None)
+        self.assertTrue(isinstance(err3, TypeError))
+        self.assertEqual((conf4.pattern.pattern, err4), ('b', None))
+
+    def test_validate_many_lazy(self):
+        class FooConfig(Config):
+            foo = ConfigInt("foo", static=True)
+            bar = ConfigInt("bar", required=True)
+
+        consumed = []
+
+        def config_data_iter():
+            for i in range(3):
+                consumed.append(i)
+                yield {'foo': i}
+
+        results = FooConfig.validate_many(config_data_iter(), static=True)
+        self.assertEqual(consumed, [])
+        conf, err = next(results)
+        self.assertEqual((conf.foo, err), (0, None))
+        self.assertEqual(consumed, [0])
+        self.assertEqual(len(list(results)), 2)
+
+    def test_prefetch_config_data(self):
+        class FooConfig(Config):
+            foo = ConfigText("foo", fallbacks=[
+                FormatStringFieldFallback(u"{bar}-{baz}", ["bar"], ["baz"])])
+            bar = ConfigText("bar", static=True)
+            baz = ConfigText("baz")
+            quux = ConfigInt(
+                "quux", static=True, fallbacks=[SingleFieldFallback("foo")])
+
+        self.assertEqual(
+            FooConfig._data_keys, ('bar', 'baz', 'foo', 'quux'))
+        self.assertEqual(
+            FooConfig._static_data_keys, ('bar', 'quux', 'foo', 'baz'))
+
+        config_data = RemoteConfigData({'bar': u'a', 'quux': 1, 'x': 2})
+        conf = FooConfig(config_data)
+        self.assertEqual(config_data.requests, [
+            ('get_many', ('bar', 'baz', 'foo', 'quux'))])
+        self.assertEqual(conf._config_data, {'bar': u'a', 'quux': 1})
+        self.assertEqual(conf.foo, u'a-None')
+
+        config_data = RemoteConfigData({'bar': u'a', 'quux': 1, 'x': 2})
+        FooConfig(config_data, static=True)
+        self.assertEqual(config_data.requests, [
+            ('get_many', ('bar', 'quux', 'foo', 'baz'))])
+
+    def test_config_data_without_get_many(self):
+        class FooConfig(Config):
+            foo = ConfigText("foo", required=True)
+            bar = ConfigText("bar")
+
+        config_data = RemoteConfigData({'foo': u'a'}, batched=False)
+        conf = FooConfig(config_data)
+        self.assertTrue(conf._config_data is config_data)
+        self.assertEqual(conf.foo, u'a')
+        self.assertTrue(len(config_data.requests) > 1)
+
+    def test_get_data_keys(self):
+        class FooConfig(Config):
+            foo = ConfigText("foo", static=True)
+            bar = ConfigText(
+                "bar", fallbacks=[SingleFieldFallback("baz")])
+            baz = ConfigText("baz")
+
+        self.assertEqual(FooConfig.get_data_keys(), ('foo', 'baz', 'bar'))
+        self.assertEqual(FooConfig.get_data_keys(static=True), ('foo',))
+
+    def test_async_loading(self):
+        class FooConfig(Config):
+            foo = ConfigText("foo", required=True)
+            bar = ConfigInt(
+                "bar", fallbacks=[SingleFieldFallback("baz")])
+            baz = ConfigInt("baz")
+
+        class AsyncStore(object):
+            """
+            In-memory stand-in for an asynchronous store. Requests complete
+            when the test runs the pending callbacks.
+            """
+
+            def __init__(self, data):
+                self.data = data
+                self.pending = []
+
+            def get(self, key, callback):
+                self.pending.append(
+                    lambda: callback(key, self.data.get(key)))
+
+            def run_pending(self):
+                pending, self.pending = self.pending, []
+                for func in pending:
+                    func()
+
+        store = AsyncStore({'foo': u'a', 'baz': 2, 'other': 3})
+        fetched = {}
+        configs = []
+        keys = FooConfig.get_data_keys()
+
+        def got_value(key, value):
+            if value is not None:
+                fetched[key] = value
+            keys_left.remove(key)
+            if not keys_left:
+                configs.append(FooConfig(fetched))
+
+        # Request all the keys at once, as concurrent requests.
+        keys_left = set(keys)
+        for key in keys:
+            store.get(key, got_value)
+        self.assertEqual(len(store.pending), 3)
+        self.assertEqual(configs, [])
+
+        store.run_pending()
+        [conf] = configs
+        self.assertEqual((conf.foo, conf.bar, conf.baz), (u'a', 2, 2))
+
     def test_fields_read_only(self):
         class FooConfig(Config):
             foo = ConfigInt("foo")
@@ -228,6 +523,285 @@ class TestConfig(TestCase):
         conf = FooConfig({'foo': 1})
         self.assertRaises(AttributeError, setattr, conf, 'foo', 2)
 
+    def test_values_not_cached_by_default(self):
+        class FooConfig(Config):
+            foo = ConfigInt("foo")
+
+        data = {'foo': 1}
+        conf = FooConfig(data)
+        data['foo'] = 2
+        self.assertEqual(conf.foo, 2)
+
+    def test_cache_values(self):
+        cleaned = []
+
+        class CountingField(ConfigField):
+            def clean(self, value):
+                cleaned.append(value)
+                return value
+
+        class FooConfig(Config):
+            cache_values = True
+            foo = CountingField("foo")
+
+        conf = FooConfig({'foo': 'blah'})
+        self.assertEqual(cleaned, ['blah'])
+        self.assertEqual(conf.foo, 'blah')
+        self.assertEqual(conf.foo, 'blah')
+        self.assertEqual(cleaned, ['blah'])
+
+    def test_cache_values_overridden_validate(self):
+        class PositiveField(ConfigInt):
+            def validate(self, config):
+                super(PositiveField, self).validate(config)
+                value = self.get_value(config)
+                if value is not None and value <= 0:
+                    self.raise_config_error("must be positive.")
+
+        class FooConfig(Config):
+            cache_values = True
+            foo = PositiveField("foo")
+
+        conf = FooConfig({'foo': 5})
+        self.assertEqual(conf._value_cache, {})
+        self.assertEqual(conf.foo, 5)
+        self.assertEqual(conf._value_cache, {'foo': 5})
+        self.assertRaises(ConfigError, FooConfig, {'foo': -1})
+
+    def test_cache_values_not_stored_for_skipped_fields(self):
+        class FooConfig(Config):
+            cache_values = True
+            foo = ConfigField("foo", static=True)
+            bar = ConfigField("bar")
+
+        conf = FooConfig({'foo': 'blah', 'bar': 'baz'}, static=True)
+        self.assertEqual(conf._value_cache, {'foo': 'blah'})
+
+    def test_cache_values_static(self):
+        class FooConfig(Config):
+            cache_values = True
+            foo = ConfigField("foo", static=True)
+            bar = ConfigField("bar")
+
+        conf = FooConfig({'foo': 'blah', 'bar': 'baz'}, static=True)
+        self.assertEqual(conf.foo, 'blah')
+        self.assertRaises(ConfigError, lambda: conf.bar)
+
+    def test_invalidate_cache(self):
+        class FooConfig(Config):
+            cache_values = True
+            foo = ConfigInt("foo")
+            bar = ConfigInt("bar")
+
+        data = {'foo': 1, 'bar': 2}
+        conf = FooConfig(data)
+        self.assertEqual((conf.foo, conf.bar), (1, 2))
+        data.update({'foo': 3, 'bar': 4})
+        self.assertEqual((conf.foo, conf.bar), (1, 2))
+
+        conf.invalidate_cache('foo')
+        self.assertEqual((conf.foo, conf.bar), (3, 2))
+
+        conf.invalidate_cache()
+        self.assertEqual((conf.foo, conf.bar), (3, 4))
+
+    def test_reload(self):
+        cleaned = []
+
+        class CountingField(ConfigField):
+            def clean(self, value):
+                cleaned.append(value)
+                return value
+
+        class FooConfig(Config):
+            cache_values = True
+            foo = CountingField("foo")
+            bar = CountingField("bar")
+
+        conf = FooConfig({'foo': 'a', 'bar': 'b'})
+        del cleaned[:]
+        self.assertEqual(
+            conf.reload({'foo': 'c', 'bar': 'b'}), frozenset(['foo']))
+        self.assertEqual(cleaned, ['c'])
+        self.assertEqual((conf.foo, conf.bar), ('c', 'b'))
+        self.assertEqual(cleaned, ['c'])
+
+    def test_reload_unchanged(self):
+        post_validated = []
+
+        class FooConfig(Config):
+            foo = ConfigInt("foo")
+
+            def post_validate(self):
+                post_validated.append(self.foo)
+
+        conf = FooConfig({'foo': 1})
+        self.assertEqual(conf.reload({'foo': 1}), frozenset())
+        self.assertEqual(post_validated, [1])
+
+    def test_reload_changed_type(self):
+        class FooConfig(Config):
+            foo = ConfigField("foo")
+
+        conf = FooConfig({'foo': 1})
+        self.assertEqual(conf.reload({'foo': 1.0}), frozenset(['foo']))
+        self.assertEqual(conf.reload({}), frozenset(['foo']))
+        self.assertEqual(conf.foo, None)
+
+    def test_reload_fallback_dependents(self):
+        class FooConfig(Config):
+            cache_values = True
+            foo = ConfigText("foo")
+            bar = ConfigText("bar", fallbacks=[SingleFieldFallback("foo")])
+            baz = ConfigText("baz", fallbacks=[
+                FormatStringFieldFallback("{bar}-", ["bar"])])
+            quux = ConfigText("quux")
+
+        conf = FooConfig({'foo': u'a', 'quux': u'q'})
+        self.assertEqual(
+            conf.reload({'foo': u'b', 'quux': u'q'}),
+            frozenset(['foo', 'bar', 'baz']))
+        self.assertEqual(
+            (conf.foo, conf.bar, conf.baz, conf.quux),
+            (u'b', u'b', u'b-', u'q'))
+
+    def test_reload_provider(self):
+        class FooConfig(Config):
+            foo = ConfigInt("foo")
+            bar = ConfigInt("bar")
+
+        conf = FooConfig(StrictConfigData({'foo': 1, 'bar': 2}))
+        self.assertEqual(
+            conf.reload(StrictConfigData({'foo': 3, 'bar': 2})),
+            frozenset(['foo']))
+        self.assertEqual((conf.foo, conf.bar), (3, 2))
+
+    def test_reload_post_validate(self):
+        class FooConfig(Config):
+            foo = ConfigInt("foo")
+
+            def post_validate(self):
+                if self.foo < 0:
+                    self.raise_config_error("foo must not be negative.")
+
+        conf = FooConfig({'foo': 1})
+        conf.reload({'foo': 2})
+        self.assertEqual(conf.foo, 2)
+        self.assertRaises(ConfigError, conf.reload, {'foo': -1})
+        self.assertEqual(conf.foo, 2)
+
+    def test_reload_failure_restores_config(self):
+        class FooConfig(Config):
+            cache_values = True
+            foo = ConfigInt("foo", required=True)
+            bar = ConfigInt("bar")
+
+        conf = FooConfig({'foo': 1, 'bar': 2})
+        self.assertRaises(ConfigError, conf.reload, {'bar': 3})
+        self.assertEqual((conf.foo, conf.bar), (1, 2))
+        self.assertEqual(conf._value_cache, {'foo': 1, 'bar': 2})
+
+    def test_reload_static(self):
+        class FooConfig(Config):
+            foo = ConfigInt("foo", static=True)
+            bar = ConfigInt("bar")
+
+        conf = FooConfig({'foo': 1, 'bar': 2}, static=True)
+        self.assertEqual(conf.reload({'foo': 1, 'bar': 3}), frozenset())
+        self.assertEqual(
+            conf.reload({'foo': 2, 'bar': 3}), frozenset(['foo']))
+        self.assertEqual(conf.foo, 2)
+
+    def test_from_validated_data(self):
+        class FooConfig(Config):
+            foo = ConfigInt("foo", required=True)
+            bar = ConfigInt("bar", static=True)
+
+            def post_validate(self):
+                self.raise_config_error("Not validated.")
+
+        conf = FooConfig.from_validated_data({'foo': 1, 'bar': 2})
+        self.assertEqual((conf.foo, conf.bar), (1, 2))
+        conf = FooConfig.from_validated_data({'bar': 2}, static=True)
+        self.assertTrue(conf.static)
+        self.assertEqual(conf.bar, 2)
+        self.assertRaises(ConfigError, lambda: conf.foo)
+
+    def test_diff(self):
+        class FooConfig(Config):
+            foo = ConfigInt("foo")
+            bar = ConfigText("bar", fallbacks=[SingleFieldFallback("baz")])
+            baz = ConfigText("baz")
+            quux = ConfigText("quux")
+
+        old = FooConfig({'foo': 1, 'baz': u'a', 'quux': u'q'})
+        new = FooConfig({'foo': 1, 'baz': u'b', 'quux': u'q'})
+        self.assertEqual(old.diff(new), {
+            'bar': (u'a', u'b'),
+            'baz': (u'a', u'b'),
+        })
+        self.assertEqual(new.diff(old), {
+            'bar': (u'b', u'a'),
+            'baz': (u'b', u'a'),
+        })
+        self.assertEqual(old.diff(old), {})
+
+    def test_diff_provider(self):
+        class FooConfig(Config):
+            foo = ConfigInt("foo")
+            bar = ConfigInt("bar")
+
+        old = FooConfig(StrictConfigData({'foo': 1, 'bar': 2}))
+        new = FooConfig(StrictConfigData({'foo': 3, 'bar': 2}))
+        self.assertEqual(old.diff(new), {'foo': (1, 3)})
+
+    def test_diff_skips_unchanged_fields(self):
+        cleaned = []
+
+        class CountingDict(ConfigDict):
+            def clean(self, value):
+                cleaned.append(value)
+                return super(CountingDict, self).clean(value)
+
+        class FooConfig(Config):
+            foo = ConfigInt("foo")
+            routes = CountingDict("routes")
+
+        routes = dict(('route%d' % i, i) for i in range(100))
+        old = FooConfig({'foo': 1, 'routes': routes})
+        new = FooConfig({'foo': 2, 'routes': routes})
+        del cleaned[:]
+        self.assertEqual(old.diff(new), {'foo': (1, 2)})
+        self.assertEqual(cleaned, [])
+
+    def test_diff_compares_cleaned_values(self):
+        class FooConfig(Config):
+            foo = ConfigInt("foo")
+
+        old = FooConfig({'foo': 1})
+        new = FooConfig({'foo': '1'})
+        self.assertEqual(old.diff(new), {})
+        self.assertEqual(old.diff(FooConfig({})), {'foo': (1, None)})
+
+    def test_diff_static(self):
+        class FooConfig(Config):
+            foo = ConfigInt("foo", static=True)
+            bar = ConfigInt("bar")
+
+        old = FooConfig({'foo': 1, 'bar': 2}, static=True)
+        new = FooConfig({'foo': 3, 'bar': 4})
+        self.assertEqual(old.diff(new), {'foo': (1, 3)})
+
+    def test_diff_different_classes(self):
+        class FooConfig(Config):
+            foo = ConfigInt("foo")
+
+        class BarConfig(FooConfig):
+            pass
+
+        self.assertRaises(
+            TypeError, FooConfig({}).diff, BarConfig({}))
+
 
 class TestFieldFallback(TestCase):
     def test_get_field_descriptor(self):
@@ -276,6 +850,13 @@ class TestFieldFallback(TestCase):
         })
         self.assertEqual(fallback.present(cfg), True)
 
+    def test_get_dependencies(self):
+        fallback = FieldFallback()
+        self.assertEqual(fallback.get_dependencies(), ())
+        fallback.required_fields = ["foo"]
+        fallback.optional_fields = ["bar"]
+        self.assertEqual(fallback.get_dependencies(), ("foo", "bar"))
+
     def test_build_value_not_implemented(self):
         fallback = FieldFallback()
         self.assertRaises(NotImplementedError, fallback.build_value, None)
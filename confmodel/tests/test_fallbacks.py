@@ -1,6 +1,7 @@
 from unittest import TestCase
 
 from confmodel.config import Config
+from confmodel.errors import ConfigError
 from confmodel.fallbacks import SingleFieldFallback, FormatStringFieldFallback
 from confmodel.fields import ConfigText, ConfigInt
 
@@ -92,3 +93,181 @@ class TestConfigFieldWithFallback(TestCase):
 
         config = ConfigWithFallback({})
         self.assertEqual(ConfigWithFallback.newfield.present(config), False)
+
+    def test_undefined_fallback_field(self):
+        def define_config():
+            class ConfigWithFallback(Config):
+                newfield = ConfigText(
+                    "newfield", fallbacks=[SingleFieldFallback("oldfield")])
+
+        self.assertRaises(ConfigError, define_config)
+
+    def test_circular_fallback_fields(self):
+        def define_config():
+            class ConfigWithFallback(Config):
+                field_a = ConfigText(
+                    "field_a", fallbacks=[SingleFieldFallback("field_b")])
+                field_b = ConfigText(
+                    "field_b", fallbacks=[FormatStringFieldFallback(
+                        "{field_c}", [], ["field_c"])])
+                field_c = ConfigText(
+                    "field_c", fallbacks=[SingleFieldFallback("field_a")])
+
+        try:
+            define_config()
+        except ConfigError as err:
+            self.assertEqual(
+                str(err), "Circular fallback fields: "
+                "'field_a' -> 'field_b' -> 'field_c' -> 'field_a'")
+        else:
+            self.fail("Expected ConfigError.")
+
+    def test_fallback_dependencies(self):
+        class ConfigWithFallback(Config):
+            url = ConfigText("url", fallbacks=[
+                FormatStringFieldFallback(
+                    "{host}:{port}", ["host"], ["port"]),
+                SingleFieldFallback("oldurl")])
+            host = ConfigText("host")
+            port = ConfigInt("port")
+            oldurl = ConfigText(
+                "oldurl", fallbacks=[SingleFieldFallback("host")])
+
+        self.assertEqual(ConfigWithFallback._field_dependencies, {
+            "url": ("host", "port", "oldurl"),
+            "host": (),
+            "port": (),
+            "oldurl": ("host",),
+        })
+        self.assertEqual(ConfigWithFallback._field_dependents, {
+            "url": frozenset(),
+            "host": frozenset(["url", "oldurl"]),
+            "port": frozenset(["url"]),
+            "oldurl": frozenset(["url"]),
+        })
+        # Fields are validated after the fields they fall back to.
+        self.assertEqual(
+            [f.name for f, _ in ConfigWithFallback._validation_plan],
+            ["host", "port", "oldurl", "url"])
+
+    def test_invalidate_cache_dependents(self):
+        class ConfigWithFallback(Config):
+            cache_values = True
+            oldfield = ConfigText("oldfield")
+            newfield = ConfigText(
+                "newfield", fallbacks=[SingleFieldFallback("oldfield")])
+
+        data = {"oldfield": "foo"}
+        config = ConfigWithFallback(data)
+        self.assertEqual(config.newfield, "foo")
+        data["oldfield"] = "bar"
+        config.invalidate_cache("oldfield")
+        self.assertEqual(config.newfield, "bar")
+
+    def make_chain_config(self, depth, field_cls=ConfigText):
+        fields = {}
+        for i in range(depth):
+            fallback = SingleFieldFallback("field_%d" % (i + 1,))
+            fields["field_%d" % (i,)] = field_cls(
+                "field", fallbacks=[fallback])
+        fields["field_%d" % (depth,)] = field_cls("field", default=u"default")
+        return type("ChainConfig", (Config,), fields)
+
+    def test_fallback_chain(self):
+        config_cls = self.make_chain_config(20)
+        config = config_cls({"field_20": u"last"})
+        self.assertEqual(config.field_0, u"last")
+        config = config_cls({"field_7": u"middle"})
+        self.assertEqual(config.field_0, u"middle")
+        self.assertEqual(config.field_8, None)
+        # Defaults of fields used as fallbacks are ignored.
+        config = config_cls({})
+        self.assertEqual(config.field_0, None)
+        self.assertEqual(config.field_20, u"default")
+
+    def test_fallback_chain_searched_once(self):
+        lookups = []
+
+        class CountingData(dict):
+            def __contains__(self, key):
+                lookups.append(key)
+                return dict.__contains__(self, key)
+
+        config_cls = self.make_chain_config(20)
+        config = config_cls(CountingData({"field_20": u"last"}))
+        del lookups[:]
+        self.assertEqual(config.field_0, u"last")
+        self.assertEqual(len(lookups), 21)
+
+    def test_fallback_null_value(self):
+        class ConfigWithFallback(Config):
+            oldfield = ConfigText("oldfield", default=u"old default")
+            newfield = ConfigText(
+                "newfield", default=u"new default",
+                fallbacks=[SingleFieldFallback("oldfield")])
+
+        self.assertEqual(
+            ConfigWithFallback({"oldfield": None}).newfield, None)
+        self.assertEqual(ConfigWithFallback({}).newfield, u"new default")
+
+    def test_fallback_cleans_value(self):
+        class ConfigWithFallback(Config):
+            oldfield = ConfigInt("oldfield")
+            newfield = ConfigText(
+                "newfield", fallbacks=[
+                    FormatStringFieldFallback(u"{oldfield}", ["oldfield"])])
+
+        self.assertEqual(ConfigWithFallback({"oldfield": "01"}).newfield, u"1")
+        self.assertRaises(ConfigError, ConfigWithFallback, {"oldfield": "x"})
+
+    def test_fallback_uses_cached_value(self):
+        class ConfigWithFallback(Config):
+            cache_values = True
+            oldfield = ConfigText("oldfield")
+            newfield = ConfigText(
+                "newfield", fallbacks=[SingleFieldFallback("oldfield")])
+
+        data = {"oldfield": u"foo"}
+        config = ConfigWithFallback(data)
+        data["oldfield"] = u"bar"
+        config.invalidate_cache("newfield")
+        self.assertEqual(config.newfield, u"foo")
+
+    def test_fallback_to_non_static_field(self):
+        class ConfigWithFallback(Config):
+            oldfield = ConfigText("oldfield")
+            newfield = ConfigText(
+                "newfield", static=True,
+                fallbacks=[SingleFieldFallback("oldfield")])
+
+        self.assertRaises(
+            ConfigError, ConfigWithFallback, {"oldfield": u"foo"},
+            static=True)
+
+    def test_fallback_to_custom_field(self):
+        class UpperField(ConfigText):
+            def get_value(self, config):
+                value = super(UpperField, self).get_value(config)
+                return value.upper() if value is not None else u"NONE"
+
+        class ConfigWithFallback(Config):
+            oldfield = UpperField("oldfield")
+            newfield = ConfigText(
+                "newfield", fallbacks=[SingleFieldFallback("oldfield")])
+
+        self.assertEqual(
+            ConfigWithFallback({"oldfield": u"foo"}).newfield, u"FOO")
+        self.assertEqual(ConfigWithFallback({}).newfield, None)
+
+    def test_custom_single_field_fallback(self):
+        class ReversedFallback(SingleFieldFallback):
+            def build_value(self, config):
+                return getattr(config, self.field_name)[::-1]
+
+        class ConfigWithFallback(Config):
+            oldfield = ConfigText("oldfield")
+            newfield = ConfigText(
+                "newfield", fallbacks=[ReversedFallback("oldfield")])
+
+        self.assertEqual(
+            ConfigWithFallback({"oldfield": u"foo"}).newfield, u"oof")
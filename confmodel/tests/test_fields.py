@@ -1,9 +1,11 @@
+from operator import setitem
 from unittest import TestCase
 
 from confmodel.errors import ConfigError
 from confmodel.fields import (
     ConfigText, ConfigInt, ConfigFloat, ConfigBool, ConfigList, ConfigDict,
     ConfigUrl, ConfigRegex)
+from confmodel.providers import JSONArrayView, JSONObjectView
 
 
 class FakeModel(object):
@@ -52,6 +54,17 @@ class TestConfigFields(TestCase):
         self.assertFalse(value.match('notvumi'))
         self.assertEqual(None, self.field_value(field, None))
 
+    def test_regex_field_cached(self):
+        field = self.make_field(ConfigRegex)
+        ConfigRegex.pattern_cache.clear()
+        value = self.field_value(field, '^v[a-z]m[a-z]$')
+        self.assertTrue(self.field_value(field, '^v[a-z]m[a-z]$') is value)
+        unicode_value = self.field_value(field, u'^v[a-z]m[a-z]$')
+        self.assertEqual(unicode_value.pattern, u'^v[a-z]m[a-z]$')
+        self.assertTrue(isinstance(unicode_value.pattern, unicode))
+        self.assertEqual(ConfigRegex.pattern_cache.stats(), {
+            'hits': 4, 'misses': 2, 'size': 2, 'maxsize': 512})
+
     def test_int_field(self):
         field = self.make_field(ConfigInt)
         self.assertEqual(0, self.field_value(field, 0))
@@ -132,6 +145,66 @@ class TestConfigFields(TestCase):
         value['fault'] = 'yours'
         self.assertEqual(field.get_value(model), {'fault': 'mine'})
 
+    def test_frozen_list_field(self):
+        field = self.make_field(ConfigList, frozen=True)
+        self.assertEqual([], self.field_value(field, []))
+        self.assertEqual([0], self.field_value(field, (0,)))
+        self.assertEqual([[0]], self.field_value(field, [[0]]))
+        self.assertEqual(None, self.field_value(field, None))
+        self.assert_field_invalid(field, object())
+        self.assert_field_invalid(field, "foo")
+
+    def test_frozen_list_field_immutable(self):
+        field = self.make_field(ConfigList, frozen=True)
+        data = ['fault', ['mine']]
+        value = field.get_value(self.fake_model(data))
+        self.assertTrue(value._data is data)
+        self.assertRaises(TypeError, setitem, value, 0, 'yours')
+        self.assertRaises(AttributeError, getattr, value[1], 'append')
+        value_copy = value.copy()
+        value_copy[1].append('yours')
+        self.assertEqual(data, ['fault', ['mine']])
+
+    def test_frozen_dict_field(self):
+        field = self.make_field(ConfigDict, frozen=True)
+        self.assertEqual({}, self.field_value(field, {}))
+        self.assertEqual({'foo': 1}, self.field_value(field, {'foo': 1}))
+        self.assertEqual(None, self.field_value(field, None))
+        self.assert_field_invalid(field, object())
+        self.assert_field_invalid(field, [])
+
+    def test_frozen_dict_field_immutable(self):
+        field = self.make_field(ConfigDict, frozen=True)
+        data = {'fault': {'mine': ['all']}}
+        value = field.get_value(self.fake_model(data))
+        self.assertTrue(value._data is data)
+        self.assertRaises(TypeError, setitem, value, 'fault', 'yours')
+        self.assertRaises(
+            TypeError, setitem, value['fault'], 'mine', 'yours')
+        value_copy = value.copy()
+        value_copy['fault']['mine'].append('yours')
+        self.assertEqual(data, {'fault': {'mine': ['all']}})
+
+    def test_json_view_list_field(self):
+        data = '[1, {"a": 2}]'
+        view = JSONArrayView(data, 0, len(data))
+        field = self.make_field(ConfigList, frozen=True)
+        self.assertTrue(field.get_value(self.fake_model(view)) is view)
+        field = self.make_field(ConfigList)
+        value = field.get_value(self.fake_model(view))
+        self.assertEqual(type(value), list)
+        self.assertEqual(value, [1, {'a': 2}])
+
+    def test_json_view_dict_field(self):
+        data = '{"a": [1, 2]}'
+        view = JSONObjectView(data, 0, len(data))
+        field = self.make_field(ConfigDict, frozen=True)
+        self.assertTrue(field.get_value(self.fake_model(view)) is view)
+        field = self.make_field(ConfigDict)
+        value = field.get_value(self.fake_model(view))
+        self.assertEqual(type(value), dict)
+        self.assertEqual(value, {'a': [1, 2]})
+
     def test_url_field(self):
         def assert_url(value,
                        scheme='', netloc='', path='', query='', fragment=''):
@@ -150,3 +223,16 @@ class TestConfigFields(TestCase):
         self.assertEqual(None, self.field_value(field))
         self.assert_field_invalid(field, object())
         self.assert_field_invalid(field, 1)
+
+    def test_url_field_cached(self):
+        field = self.make_field(ConfigUrl)
+        ConfigUrl.url_cache.clear()
+        value = self.field_value(field, 'http://example.com/foo')
+        self.assertTrue(
+            self.field_value(field, 'http://example.com/foo') is value)
+        self.assertRaises(AttributeError, setattr, value, 'path', '/bar')
+        self.assertEqual(
+            self.field_value(field, u'http://example.com/foo\u1234').path,
+            '/foo\xe1\x88\xb4')
+        self.assertEqual(ConfigUrl.url_cache.stats(), {
+            'hits': 4, 'misses': 2, 'size': 2, 'maxsize': 512})
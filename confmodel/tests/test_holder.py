@@ -0,0 +1,100 @@
+from threading import Event, Thread
+from unittest import TestCase
+
+from confmodel.config import Config
+from confmodel.errors import ConfigError
+from confmodel.fields import ConfigInt
+from confmodel.holder import ConfigHolder
+
+
+class GenerationConfig(Config):
+    cache_values = True
+    generation = ConfigInt("generation", required=True, static=True)
+    copy = ConfigInt("copy", required=True)
+
+    def post_validate(self):
+        if not self.static and self.copy != self.generation:
+            self.raise_config_error("copy must match generation.")
+
+
+def generation_data(generation):
+    return {'generation': generation, 'copy': generation}
+
+
+class TestConfigHolder(TestCase):
+    def test_config(self):
+        config = GenerationConfig(generation_data(1))
+        holder = ConfigHolder(config)
+        self.assertIs(holder.config, config)
+
+    def test_publish(self):
+        config1 = GenerationConfig(generation_data(1))
+        config2 = GenerationConfig(generation_data(2))
+        holder = ConfigHolder(config1)
+        self.assertIs(holder.publish(config2), config1)
+        self.assertIs(holder.config, config2)
+
+    def test_reload(self):
+        holder = ConfigHolder(GenerationConfig(generation_data(1)))
+        config = holder.reload(generation_data(2))
+        self.assertIs(holder.config, config)
+        self.assertEqual(config.generation, 2)
+
+    def test_reload_static(self):
+        holder = ConfigHolder(
+            GenerationConfig(generation_data(1), static=True))
+        config = holder.reload({'generation': 2})
+        self.assertTrue(config.static)
+        self.assertEqual(config.generation, 2)
+
+    def test_reload_invalid(self):
+        config = GenerationConfig(generation_data(1))
+        holder = ConfigHolder(config)
+        self.assertRaises(
+            ConfigError, holder.reload, {'generation': 2, 'copy': 3})
+        self.assertIs(holder.config, config)
+
+    def test_concurrent_readers_and_reloaders(self):
+        holder = ConfigHolder(GenerationConfig(generation_data(0)))
+        stop = Event()
+        errors = []
+        reads = []
+
+        def read():
+            count = 0
+            latest = 0
+            while not stop.is_set():
+                config = holder.config
+                if config.copy != config.generation:
+                    errors.append("Inconsistent config: %r" % (
+                        (config.generation, config.copy),))
+                if config.generation < 0:
+                    errors.append("Invalid config published.")
+                count += 1
+                latest = max(latest, config.generation)
+            reads.append((count, latest))
+
+        def reload(start):
+            for generation in range(start, start + 200):
+                holder.reload(generation_data(generation))
+                try:
+                    holder.reload({'generation': -1, 'copy': -2})
+                except ConfigError:
+                    pass
+                else:
+                    errors.append("Invalid reload succeeded.")
+
+        readers = [Thread(target=read) for _ in range(4)]
+        reloaders = [Thread(target=reload, args=(i * 1000,)) for i in range(2)]
+        for thread in readers + reloaders:
+            thread.start()
+        for thread in reloaders:
+            thread.join()
+        stop.set()
+        for thread in readers:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(reads), 4)
+        self.assertTrue(all(count > 0 for count, _ in reads))
+        self.assertIn(holder.config.generation, [199, 1199])
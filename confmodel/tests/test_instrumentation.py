@@ -0,0 +1,123 @@
+from unittest import TestCase
+
+from confmodel.config import Config
+from confmodel.fallbacks import SingleFieldFallback
+from confmodel.fields import ConfigInt, ConfigText
+from confmodel.instrumentation import Instrumentation, instrumentation
+
+
+class TestInstrumentation(TestCase):
+    def test_disabled_by_default(self):
+        self.assertEqual(Instrumentation().enabled, False)
+
+    def test_record(self):
+        class FooConfig(Config):
+            pass
+
+        instr = Instrumentation()
+        instr.record(FooConfig, 'foo', 'clean', 0.5)
+        instr.record(FooConfig, 'foo', 'clean', 0.25)
+        instr.record(FooConfig, None, 'post_validate', 1.0)
+        name = "%s.FooConfig" % (__name__,)
+        self.assertEqual(instr.snapshot(), {name: {
+            'fields': {'foo': {'clean': {'calls': 2, 'time': 0.75}}},
+            'post_validate': {'calls': 1, 'time': 1.0},
+        }})
+
+    def test_snapshot_is_a_copy(self):
+        class FooConfig(Config):
+            pass
+
+        instr = Instrumentation()
+        instr.record(FooConfig, 'foo', 'clean', 0.5)
+        snapshot = instr.snapshot()
+        instr.record(FooConfig, 'foo', 'clean', 0.5)
+        name = "%s.FooConfig" % (__name__,)
+        self.assertEqual(
+            snapshot[name]['fields']['foo']['clean']['calls'], 1)
+
+    def test_reset(self):
+        class FooConfig(Config):
+            pass
+
+        instr = Instrumentation()
+        instr.record(FooConfig, 'foo', 'clean', 0.5)
+        instr.reset()
+        self.assertEqual(instr.snapshot(), {})
+
+    def test_call(self):
+        class FooConfig(Config):
+            pass
+
+        instr = Instrumentation()
+        self.assertEqual(
+            instr.call(FooConfig, 'foo', 'clean', lambda x: x + 1, 1), 2)
+        self.assertRaises(
+            ZeroDivisionError, instr.call, FooConfig, 'foo', 'clean',
+            lambda x: 1 / x, 0)
+        name = "%s.FooConfig" % (__name__,)
+        self.assertEqual(
+            instr.snapshot()[name]['fields']['foo']['clean']['calls'], 2)
+
+
+class TestConfigInstrumentation(TestCase):
+    def setUp(self):
+        instrumentation.reset()
+        instrumentation.enable()
+        self.addCleanup(instrumentation.disable)
+        self.addCleanup(instrumentation.reset)
+
+    def get_calls(self, config_cls):
+        stats = instrumentation.snapshot()[
+            "%s.%s" % (__name__, config_cls.__name__)]
+        calls = {}
+        for field_name, field_stats in stats['fields'].items():
+            for operation, op_stats in field_stats.items():
+                calls[(field_name, operation)] = op_stats['calls']
+        if 'post_validate' in stats:
+            calls[(None, 'post_validate')] = stats['post_validate']['calls']
+        return calls
+
+    def test_config_calls_recorded(self):
+        class FooConfig(Config):
+            foo = ConfigInt("foo")
+            bar = ConfigText(
+                "bar", fallbacks=[SingleFieldFallback("baz")])
+            baz = ConfigText("baz")
+
+        config = FooConfig({'foo': 1, 'baz': u'hi'})
+        config.foo
+        config.bar
+        self.assertEqual(self.get_calls(FooConfig), {
+            ('foo', 'find_value'): 2,
+            ('foo', 'clean'): 2,
+            ('bar', 'find_value'): 2,
+            ('bar', 'fallbacks'): 2,
+            ('bar', 'clean'): 2,
+            ('baz', 'find_value'): 3,
+            ('baz', 'clean'): 3,
+            (None, 'post_validate'): 1,
+        })
+
+    def test_cached_reads_not_recorded(self):
+        class FooConfig(Config):
+            cache_values = True
+            foo = ConfigInt("foo")
+
+        config = FooConfig({'foo': 1})
+        config.foo
+        config.foo
+        self.assertEqual(self.get_calls(FooConfig), {
+            ('foo', 'find_value'): 1,
+            ('foo', 'clean'): 1,
+            (None, 'post_validate'): 1,
+        })
+
+    def test_disabled(self):
+        instrumentation.disable()
+
+        class FooConfig(Config):
+            foo = ConfigInt("foo")
+
+        FooConfig({'foo': 1}).foo
+        self.assertEqual(instrumentation.snapshot(), {})
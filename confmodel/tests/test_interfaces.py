@@ -0,0 +1,142 @@
+import imp
+import sys
+from unittest import TestCase, skipUnless
+
+from confmodel import interfaces
+from confmodel.interfaces import (
+    IConfigData, adapt_config_data, register_config_data_type,
+    prefetch_config_data)
+
+
+class ConfigData(object):
+    def get(self, field_name, default):
+        return default
+
+    def has_key(self, field_name):
+        return False
+
+    def __contains__(self, field_name):
+        return False
+
+
+def load_interfaces_without_zope():
+    """
+    Load a separate copy of confmodel.interfaces as if zope.interface was not
+    installed.
+    """
+    saved_module = sys.modules.get('zope.interface')
+    # A None entry in sys.modules makes the import fail.
+    sys.modules['zope.interface'] = None
+    try:
+        source_file = interfaces.__file__
+        if source_file.endswith('.pyc'):
+            source_file = source_file[:-1]
+        return imp.load_source('interfaces_without_zope', source_file)
+    finally:
+        if saved_module is None:
+            del sys.modules['zope.interface']
+        else:
+            sys.modules['zope.interface'] = saved_module
+        sys.modules.pop('interfaces_without_zope', None)
+
+
+class TestAdaptConfigData(TestCase):
+    def test_dict(self):
+        config_data = {'foo': 'bar'}
+        self.assertTrue(adapt_config_data(config_data) is config_data)
+
+    def test_dict_subclass(self):
+        class DictSubclass(dict):
+            pass
+
+        config_data = DictSubclass(foo='bar')
+        self.assertTrue(adapt_config_data(config_data) is config_data)
+
+    def test_registered_type(self):
+        @register_config_data_type
+        class RegisteredConfigData(ConfigData):
+            pass
+
+        config_data = RegisteredConfigData()
+        self.assertTrue(RegisteredConfigData in interfaces.config_data_types)
+        self.assertTrue(adapt_config_data(config_data) is config_data)
+
+    def test_structural_type(self):
+        config_data = ConfigData()
+        self.assertTrue(adapt_config_data(config_data) is config_data)
+
+    def test_unsupported_type(self):
+        self.assertRaises(TypeError, adapt_config_data, object())
+        self.assertRaises(TypeError, adapt_config_data, None)
+
+
+@skipUnless(interfaces.zope_interface_available,
+            "zope.interface is not installed.")
+class TestAdaptConfigDataWithZope(TestCase):
+    def test_dict(self):
+        self.assertTrue(IConfigData.providedBy({'foo': 'bar'}))
+
+    def test_registered_type(self):
+        @register_config_data_type
+        class RegisteredConfigData(ConfigData):
+            pass
+
+        self.assertTrue(IConfigData.implementedBy(RegisteredConfigData))
+        self.assertTrue(IConfigData.providedBy(RegisteredConfigData()))
+
+    def test_structural_type(self):
+        self.assertFalse(IConfigData.providedBy(ConfigData()))
+
+
+class TestPrefetchConfigData(TestCase):
+    def test_without_get_many(self):
+        config_data = {'foo': 'bar'}
+        self.assertTrue(
+            prefetch_config_data(config_data, ['foo']) is config_data)
+
+    def test_with_get_many(self):
+        class BatchedConfigData(ConfigData):
+            def get_many(self, field_names):
+                return {'fields': field_names}
+
+        self.assertEqual(
+            prefetch_config_data(BatchedConfigData(), ('foo', 'bar')),
+            {'fields': ('foo', 'bar')})
+
+
+class TestInterfacesWithoutZope(TestCase):
+    def setUp(self):
+        self.interfaces = load_interfaces_without_zope()
+
+    def test_zope_not_available(self):
+        self.assertEqual(self.interfaces.zope_interface_available, False)
+        self.assertEqual(self.interfaces.IConfigData.__bases__, (object,))
+
+    def test_dict(self):
+        config_data = {'foo': 'bar'}
+        self.assertTrue(
+            self.interfaces.adapt_config_data(config_data) is config_data)
+
+    def test_registered_type(self):
+        class RegisteredConfigData(ConfigData):
+            pass
+
+        self.interfaces.register_config_data_type(RegisteredConfigData)
+        self.assertTrue(
+            RegisteredConfigData in self.interfaces.config_data_types)
+        self.assertFalse(
+            RegisteredConfigData in interfaces.config_data_types)
+        # Without zope.interface, nothing is declared on the class.
+        self.assertFalse('__implemented__' in RegisteredConfigData.__dict__)
+        config_data = RegisteredConfigData()
+        self.assertTrue(
+            self.interfaces.adapt_config_data(config_data) is config_data)
+
+    def test_structural_type(self):
+        config_data = ConfigData()
+        self.assertTrue(
+            self.interfaces.adapt_config_data(config_data) is config_data)
+
+    def test_unsupported_type(self):
+        self.assertRaises(
+            TypeError, self.interfaces.adapt_config_data, object())
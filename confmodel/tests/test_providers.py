@@ -0,0 +1,370 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+from operator import setitem
+from unittest import TestCase
+
+from confmodel.config import Config
+from confmodel.fields import ConfigDict, ConfigInt, ConfigText
+from confmodel.interfaces import adapt_config_data
+from confmodel.providers import (
+    LayeredConfigData, JSONArrayView, JSONFileConfigData, JSONObjectView,
+    index_json_array, index_json_object, load_json_view)
+from confmodel.views import FrozenDict, FrozenList
+
+
+class TestLayeredConfigData(TestCase):
+    def make_layered(self):
+        return LayeredConfigData([
+            {'a': 'default a', 'b': 'default b', 'c': 'default c'},
+            {'b': 'site b', 'c': 'site c'},
+            {'c': 'tenant c', 'd': 'tenant d'},
+        ])
+
+    def assert_contents(self, config_data, expected):
+        self.assertEqual(sorted(config_data.keys()), sorted(expected))
+        self.assertEqual(sorted(config_data), sorted(expected))
+        for key, value in expected.items():
+            self.assertTrue(key in config_data)
+            self.assertTrue(config_data.has_key(key))  # noqa: W601
+            self.assertEqual(config_data.get(key), value)
+
+    def test_precedence(self):
+        config_data = self.make_layered()
+        self.assert_contents(config_data, {
+            'a': 'default a',
+            'b': 'site b',
+            'c': 'tenant c',
+            'd': 'tenant d',
+        })
+        self.assertFalse('e' in config_data)
+        self.assertFalse(config_data.has_key('e'))  # noqa: W601
+        self.assertEqual(config_data.get('e'), None)
+        self.assertEqual(config_data.get('e', 'default'), 'default')
+
+    def test_no_layers(self):
+        config_data = LayeredConfigData([])
+        self.assert_contents(config_data, {})
+        self.assertEqual(config_data.layers, ())
+
+    def test_layers(self):
+        layers = [{'a': 1}, {'b': 2}]
+        config_data = LayeredConfigData(layers)
+        self.assertEqual(config_data.layers, tuple(layers))
+
+    def test_replace_layer(self):
+        config_data = self.make_layered()
+        config_data.replace_layer(1, {'a': 'site a', 'e': 'site e'})
+        self.assert_contents(config_data, {
+            'a': 'site a',
+            'b': 'default b',
+            'c': 'tenant c',
+            'd': 'tenant d',
+            'e': 'site e',
+        })
+
+    def test_replace_top_layer(self):
+        config_data = self.make_layered()
+        config_data.replace_layer(2, {})
+        self.assert_contents(config_data, {
+            'a': 'default a',
+            'b': 'site b',
+            'c': 'site c',
+        })
+
+    def test_replace_bottom_layer(self):
+        config_data = self.make_layered()
+        config_data.replace_layer(0, {'b': 'default b', 'f': 'default f'})
+        self.assert_contents(config_data, {
+            'b': 'site b',
+            'c': 'tenant c',
+            'd': 'tenant d',
+            'f': 'default f',
+        })
+
+    def test_replace_layer_with_itself(self):
+        site = {'b': 'site b', 'c': 'site c'}
+        config_data = LayeredConfigData([{'a': 'default a'}, site])
+        del site['b']
+        site['a'] = 'site a'
+        config_data.replace_layer(1, site)
+        self.assert_contents(config_data, {'a': 'site a', 'c': 'site c'})
+
+    def test_config(self):
+        class FooConfig(Config):
+            foo = ConfigText("foo", required=True)
+            bar = ConfigInt("bar", default=1)
+
+        config_data = LayeredConfigData([{'foo': u'default'}, {'bar': 2}])
+        self.assertTrue(adapt_config_data(config_data) is config_data)
+        config = FooConfig(config_data)
+        self.assertEqual(config.foo, u'default')
+        self.assertEqual(config.bar, 2)
+
+
+class TestIndexJSONObject(TestCase):
+    def assert_index(self, data):
+        index = index_json_object(data)
+        parsed = dict(
+            (key, json.loads(data[start:end]))
+            for key, (start, end) in index.items())
+        self.assertEqual(parsed, json.loads(data))
+
+    def test_empty_object(self):
+        self.assertEqual(index_json_object('{}'), {})
+        self.assertEqual(index_json_object(' { }\n'), {})
+
+    def test_values(self):
+        self.assert_index(
+            '{"a": 1, "b": -2.5e3, "c": true, "d": null, "e": "text"}')
+
+    def test_nested_values(self):
+        self.assert_index(
+            '{"a": [1, [2, {"x": 3}]], "b": {"c": {"d": []}}, "e": {}}')
+
+    def test_strings_containing_delimiters(self):
+        self.assert_index(
+            '{"a,b": "}", "c:d": "[{\\"", "e\\"": ["]", ","], "f": 1}')
+
+    def test_unicode_keys(self):
+        data = json.dumps({u"k\u00e9y": 1, u"\u1234": [u"\u5678"]})
+        self.assert_index(data)
+        self.assertEqual(
+            sorted(index_json_object(data)), [u"k\u00e9y", u"\u1234"])
+
+    def test_duplicate_keys(self):
+        self.assert_index('{"a": 1, "a": 2}')
+
+    def test_not_an_object(self):
+        self.assertRaises(ValueError, index_json_object, '')
+        self.assertRaises(ValueError, index_json_object, '[1, 2]')
+        self.assertRaises(ValueError, index_json_object, '"{}"')
+        self.assertRaises(ValueError, index_json_object, '1 {}')
+
+    def test_incomplete_object(self):
+        self.assertRaises(ValueError, index_json_object, '{"a": 1')
+        self.assertRaises(ValueError, index_json_object, '{"a": {"b": 1}')
+        self.assertRaises(ValueError, index_json_object, '{"a": 1]')
+
+    def test_truncated_nested_value(self):
+        # These must fail quickly rather than backtracking exponentially.
+        start = time.time()
+        self.assertRaises(
+            ValueError, index_json_object, '{"a": [' + '1, ' * 10)
+        self.assertRaises(
+            ValueError, index_json_object, '{"a": [' + '1, ' * 10000)
+        self.assertRaises(
+            ValueError, index_json_object, '{"a": ["b", ' + '"c", 1, ' * 1000)
+        self.assertRaises(
+            ValueError, index_json_object, '{"a": {"b": "c' + ' 1,' * 1000)
+        self.assertTrue(time.time() - start < 1)
+
+
+class TestIndexJSONArray(TestCase):
+    def assert_index(self, data):
+        index = index_json_array(data)
+        parsed = [json.loads(data[start:end]) for start, end in index]
+        self.assertEqual(parsed, json.loads(data))
+
+    def test_empty_array(self):
+        self.assertEqual(index_json_array('[]'), [])
+        self.assertEqual(index_json_array(' [ ]\n'), [])
+
+    def test_values(self):
+        self.assert_index('[1, -2.5e3, true, null, "text", "]"]')
+
+    def test_nested_values(self):
+        self.assert_index('[[1, [2, {"x": 3}]], {"c": {"d": []}}, {}, []]')
+
+    def test_range(self):
+        data = '{"a": [1, [2]], "b": 3}'
+        start, end = index_json_object(data)['a']
+        self.assertEqual(
+            [data[s:e] for s, e in index_json_array(data, start, end)],
+            ['1', ' [2]'])
+
+    def test_not_an_array(self):
+        self.assertRaises(ValueError, index_json_array, '')
+        self.assertRaises(ValueError, index_json_array, '{}')
+        self.assertRaises(ValueError, index_json_array, '1 []')
+
+    def test_incomplete_array(self):
+        self.assertRaises(ValueError, index_json_array, '[1, 2')
+        self.assertRaises(ValueError, index_json_array, '[1, 2}')
+        self.assertRaises(ValueError, index_json_array, '[' + '1, ' * 10000)
+
+
+class TestJSONViews(TestCase):
+    def make_view(self, value):
+        data = json.dumps(value)
+        return load_json_view(data, 0, len(data))
+
+    def test_load_json_view(self):
+        self.assertTrue(isinstance(self.make_view({}), JSONObjectView))
+        self.assertTrue(isinstance(self.make_view([]), JSONArrayView))
+        self.assertEqual(self.make_view(1), 1)
+        self.assertEqual(self.make_view(u"text"), u"text")
+        self.assertEqual(self.make_view(None), None)
+
+    def test_object_view(self):
+        view = self.make_view({'a': 1, 'b': {'c': [2]}})
+        self.assertEqual(len(view), 2)
+        self.assertEqual(sorted(view), ['a', 'b'])
+        self.assertTrue('a' in view)
+        self.assertFalse('c' in view)
+        self.assertEqual(view['a'], 1)
+        self.assertEqual(view.get('z', 3), 3)
+        self.assertRaises(KeyError, lambda: view['z'])
+        self.assertTrue(isinstance(view['b'], JSONObjectView))
+        self.assertTrue(isinstance(view['b']['c'], JSONArrayView))
+        self.assertTrue(view['b'] is view['b'])
+
+    def test_object_view_parsed_lazily(self):
+        view = self.make_view({'a': {'b': 1}, 'c': {'d': 2}})
+        self.assertEqual(view._index, None)
+        self.assertEqual(view['a']['b'], 1)
+        self.assertEqual(view._views.keys(), ['a'])
+        self.assertEqual(view['a']._views, {})
+
+    def test_array_view(self):
+        view = self.make_view([1, [2], {'a': 3}])
+        self.assertEqual(len(view), 3)
+        self.assertEqual(view[0], 1)
+        self.assertEqual(view[-1], {'a': 3})
+        self.assertRaises(IndexError, lambda: view[3])
+        self.assertTrue(isinstance(view[1], JSONArrayView))
+        self.assertTrue(isinstance(view[2], JSONObjectView))
+        self.assertEqual(view[1:], [[2], {'a': 3}])
+        self.assertEqual(list(view), [1, [2], {'a': 3}])
+        self.assertTrue(2 in view[1])
+
+    def test_equality(self):
+        value = {'a': 1, 'b': {'c': [2, {'d': None}]}}
+        view = self.make_view(value)
+        self.assertTrue(view == value)
+        self.assertTrue(value == view)
+        self.assertTrue(view == self.make_view(value))
+        self.assertTrue(view == FrozenDict(value))
+        self.assertTrue(FrozenDict(value) == view)
+        self.assertTrue(view != {'a': 1})
+        self.assertFalse(view == [])
+        self.assertTrue(view['b']['c'] == [2, {'d': None}])
+        self.assertTrue((2, {'d': None}) == view['b']['c'])
+        self.assertTrue(view['b']['c'] == FrozenList([2, {'d': None}]))
+        self.assertTrue(view['b']['c'] != [2])
+        self.assertFalse(view['b']['c'] == {})
+
+    def test_read_only(self):
+        view = self.make_view({'a': [1]})
+        self.assertRaises(TypeError, setitem, view, 'a', 2)
+        self.assertRaises(TypeError, setitem, view['a'], 0, 2)
+        self.assertRaises(AttributeError, getattr, view, 'update')
+        self.assertRaises(AttributeError, getattr, view['a'], 'append')
+
+    def test_copy(self):
+        view = self.make_view({'a': [1]})
+        view_copy = view.copy()
+        self.assertEqual(view_copy, {'a': [1]})
+        self.assertEqual(type(view_copy), dict)
+        self.assertEqual(type(view['a'].copy()), list)
+
+
+class TestJSONFileConfigData(TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tempdir)
+
+    def write_file(self, content):
+        filename = os.path.join(self.tempdir, 'config.json')
+        with open(filename, 'wb') as f:
+            f.write(content)
+        return filename
+
+    def make_config_data(self, data):
+        config_data = JSONFileConfigData(self.write_file(json.dumps(data)))
+        self.addCleanup(config_data.close)
+        return config_data
+
+    def test_lookup(self):
+        config_data = self.make_config_data({'a': 1, 'b': {'c': [2, 3]}})
+        self.assertEqual(sorted(config_data), ['a', 'b'])
+        self.assertEqual(sorted(config_data.keys()), ['a', 'b'])
+        self.assertTrue('a' in config_data)
+        self.assertTrue(config_data.has_key('b'))  # noqa: W601
+        self.assertFalse('c' in config_data)
+        self.assertEqual(config_data.get('a'), 1)
+        self.assertEqual(config_data.get('b'), {'c': [2, 3]})
+        self.assertEqual(config_data.get('c'), None)
+        self.assertEqual(config_data.get('c', 4), 4)
+
+    def test_values_parsed_lazily(self):
+        config_data = self.make_config_data({'a': 1, 'b': {'c': [2, 3]}})
+        self.assertEqual(config_data._values, {})
+        value = config_data.get('b')
+        self.assertEqual(config_data._values, {'b': {'c': [2, 3]}})
+        self.assertTrue(config_data.get('b') is value)
+
+    def test_values_available_after_close(self):
+        config_data = self.make_config_data({'a': 1, 'b': 2})
+        config_data.get('a')
+        config_data.close()
+        self.assertEqual(config_data.get('a'), 1)
+
+    def test_invalid_value(self):
+        config_data = JSONFileConfigData(
+            self.write_file('{"a": 1, "b": [2, x]}'))
+        self.addCleanup(config_data.close)
+        self.assertEqual(config_data.get('a'), 1)
+        self.assertRaises(ValueError, config_data.get, 'b')
+
+    def test_nested_views(self):
+        filename = self.write_file(
+            json.dumps({'a': 1, 'b': {'c': [2, 3]}, 'd': [4]}))
+        config_data = JSONFileConfigData(filename, nested_views=True)
+        self.addCleanup(config_data.close)
+        self.assertEqual(config_data.get('a'), 1)
+        view = config_data.get('b')
+        self.assertTrue(isinstance(view, JSONObjectView))
+        self.assertTrue(config_data.get('b') is view)
+        self.assertEqual(view, {'c': [2, 3]})
+        self.assertTrue(isinstance(config_data.get('d'), JSONArrayView))
+
+    def test_nested_views_for_keys(self):
+        filename = self.write_file(
+            json.dumps({'a': 1, 'b': {'c': [2, 3]}, 'd': [4]}))
+        config_data = JSONFileConfigData(filename, nested_views=['b'])
+        self.addCleanup(config_data.close)
+        self.assertEqual(config_data.get('a'), 1)
+        self.assertTrue(isinstance(config_data.get('b'), JSONObjectView))
+        self.assertEqual(type(config_data.get('d')), list)
+
+    def test_truncated_file(self):
+        self.assertRaises(
+            ValueError, JSONFileConfigData,
+            self.write_file('{"a": 1, "b": [' + '2, ' * 10000))
+
+    def test_not_an_object(self):
+        self.assertRaises(
+            ValueError, JSONFileConfigData, self.write_file(''))
+        self.assertRaises(
+            ValueError, JSONFileConfigData, self.write_file('[]'))
+
+    def test_config(self):
+        class FooConfig(Config):
+            foo = ConfigText("foo", required=True, static=True)
+            routes = ConfigDict("routes", frozen=True)
+
+        config_data = self.make_config_data({
+            'foo': u'bar',
+            'routes': {'a': ['b']},
+            'unused': [{'x': 1}] * 100,
+        })
+        self.assertTrue(adapt_config_data(config_data) is config_data)
+        config = FooConfig(config_data, static=True)
+        self.assertEqual(config.foo, u'bar')
+        self.assertEqual(sorted(config_data._values), ['foo'])
+        config = FooConfig(config_data)
+        self.assertEqual(config.routes, {'a': ['b']})
+        self.assertEqual(sorted(config_data._values), ['foo', 'routes'])
@@ -0,0 +1,234 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from confmodel.config import Config
+from confmodel.errors import ConfigError
+from confmodel.fallbacks import SingleFieldFallback
+from confmodel.config import ConfigField
+from confmodel.fields import (
+    ConfigDict, ConfigInt, ConfigList, ConfigText)
+from confmodel.providers import JSONArrayView, JSONObjectView
+from confmodel.snapshot import (
+    SNAPSHOT_INFO_KEY, attach_snapshot, write_snapshot)
+
+
+class SnapshotConfig(Config):
+    name = ConfigText("name", required=True, static=True)
+    title = ConfigText("title", fallbacks=[SingleFieldFallback("name")])
+    routes = ConfigDict("routes", frozen=True)
+    size = ConfigInt("size")
+
+    def post_validate(self):
+        if not self.static and self.size is not None and self.size < 0:
+            self.raise_config_error("size must not be negative.")
+
+
+class TestSnapshot(TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tempdir)
+        self.filename = os.path.join(self.tempdir, 'snapshot.json')
+
+    def read_snapshot(self):
+        with open(self.filename, 'rb') as f:
+            return json.load(f)
+
+    def test_write_snapshot(self):
+        config = SnapshotConfig({
+            'name': 'foo',
+            'routes': {'a': 1},
+            'size': '3',
+            'unused': 'blah',
+        })
+        write_snapshot(config, self.filename)
+        self.assertEqual(self.read_snapshot(), {
+            'name': 'foo',
+            'routes': {'a': 1},
+            'size': '3',
+            SNAPSHOT_INFO_KEY: {
+                'config_class': __name__ + '.SnapshotConfig',
+                'static': False,
+            },
+        })
+        self.assertEqual(os.listdir(self.tempdir), ['snapshot.json'])
+
+    def get_mode(self):
+        return os.stat(self.filename).st_mode & 0777
+
+    def set_umask(self, umask):
+        self.addCleanup(os.umask, os.umask(umask))
+
+    def test_write_snapshot_umask(self):
+        config = SnapshotConfig({'name': 'foo'})
+        self.set_umask(0077)
+        write_snapshot(config, self.filename)
+        self.assertEqual(self.get_mode(), 0600)
+        self.set_umask(0022)
+        write_snapshot(config, self.filename)
+        self.assertEqual(self.get_mode(), 0644)
+
+    def test_write_snapshot_mode(self):
+        self.set_umask(0022)
+        write_snapshot(
+            SnapshotConfig({'name': 'foo'}), self.filename, mode=0640)
+        self.assertEqual(self.get_mode(), 0640)
+
+    def test_write_snapshot_static(self):
+        config = SnapshotConfig({'name': 'foo', 'size': 3}, static=True)
+        write_snapshot(config, self.filename)
+        snapshot = self.read_snapshot()
+        self.assertEqual(snapshot.pop(SNAPSHOT_INFO_KEY)['static'], True)
+        self.assertEqual(snapshot, {'name': 'foo'})
+
+    def test_write_snapshot_failure(self):
+        config = SnapshotConfig({'name': 'foo', 'routes': {'a': object()}})
+        self.assertRaises(TypeError, write_snapshot, config, self.filename)
+        self.assertEqual(os.listdir(self.tempdir), [])
+
+    def test_write_snapshot_changed_by_json(self):
+        class AnyConfig(Config):
+            value = ConfigField("value")
+
+        for value in [{1: 'x'}, (1, 2), {'a': [(1, 2)]}]:
+            self.assertRaises(
+                ValueError, write_snapshot, AnyConfig({'value': value}),
+                self.filename)
+        self.assertEqual(os.listdir(self.tempdir), [])
+
+    def test_attach_snapshot(self):
+        routes = dict(('route%d' % i, i) for i in range(100))
+        write_snapshot(SnapshotConfig({
+            'name': 'foo',
+            'routes': routes,
+            'size': 3,
+        }), self.filename)
+        config = attach_snapshot(SnapshotConfig, self.filename)
+        self.assertEqual(
+            config._config_data._values.keys(), [SNAPSHOT_INFO_KEY])
+        self.assertEqual(config.name, u'foo')
+        self.assertEqual(config._config_data._values['name'], u'foo')
+        self.assertEqual(config.title, u'foo')
+        self.assertEqual(config.routes, routes)
+        self.assertEqual(config.size, 3)
+
+    def test_attach_snapshot_lazy_views(self):
+        routes = dict(
+            ('route%d' % i, {'target': 'backend%d' % i, 'weights': [i, 1]})
+            for i in range(100))
+        write_snapshot(SnapshotConfig({
+            'name': 'foo',
+            'routes': routes,
+        }), self.filename)
+        config = attach_snapshot(SnapshotConfig, self.filename)
+        view = config.routes
+        self.assertTrue(isinstance(view, JSONObjectView))
+        self.assertTrue(config.routes is view)
+        self.assertEqual(view['route7']['target'], u'backend7')
+        self.assertEqual(view['route7']['weights'][0], 7)
+        # Only the route that was read has been indexed.
+        self.assertEqual(view._views.keys(), ['route7'])
+        self.assertEqual(len(view), 100)
+        self.assertEqual(view.copy(), routes)
+
+    def test_attach_snapshot_views_only_for_frozen_fields(self):
+        class StrictDict(ConfigDict):
+            def clean(self, value):
+                if not isinstance(value, dict):
+                    self.raise_config_error("is not a real dict.")
+                return super(StrictDict, self).clean(value)
+
+        class ViewsConfig(Config):
+            frozen_dict = ConfigDict("frozen_dict", frozen=True)
+            frozen_list = ConfigList("frozen_list", frozen=True)
+            mutable_dict = ConfigDict("mutable_dict")
+            strict_dict = StrictDict("strict_dict", frozen=True)
+            plain = ConfigField("plain")
+            plain_fallback = ConfigField(
+                "plain_fallback", fallbacks=[SingleFieldFallback("shared")])
+            shared = ConfigDict("shared", frozen=True)
+
+        value = {'a': [1, 2]}
+        write_snapshot(ViewsConfig({
+            'frozen_dict': value,
+            'frozen_list': [value],
+            'mutable_dict': value,
+            'strict_dict': value,
+            'plain': value,
+            'shared': value,
+        }), self.filename)
+        for validate in [False, True]:
+            config = attach_snapshot(
+                ViewsConfig, self.filename, validate=validate)
+            self.assertTrue(isinstance(config.frozen_dict, JSONObjectView))
+            self.assertTrue(isinstance(config.frozen_list, JSONArrayView))
+            self.assertEqual(type(config.mutable_dict), dict)
+            self.assertEqual(config.strict_dict, value)
+            self.assertEqual(type(config.plain), dict)
+            self.assertEqual(config.plain_fallback, value)
+            self.assertFalse(
+                isinstance(config.plain_fallback, JSONObjectView))
+            self.assertEqual(config.shared, value)
+            self.assertFalse(isinstance(config.shared, JSONObjectView))
+
+    def test_write_snapshot_from_snapshot(self):
+        routes = {'a': {'b': [1, 2]}}
+        write_snapshot(
+            SnapshotConfig({'name': 'foo', 'routes': routes}), self.filename)
+        config = attach_snapshot(SnapshotConfig, self.filename)
+        other = os.path.join(self.tempdir, 'other.json')
+        write_snapshot(config, other)
+        self.assertEqual(
+            attach_snapshot(SnapshotConfig, other).routes, routes)
+
+    def test_attach_snapshot_static(self):
+        write_snapshot(
+            SnapshotConfig({'name': 'foo', 'size': 3}), self.filename)
+        config = attach_snapshot(SnapshotConfig, self.filename, static=True)
+        self.assertEqual(config.name, u'foo')
+        self.assertRaises(ConfigError, lambda: config.size)
+
+    def test_attach_static_snapshot(self):
+        write_snapshot(
+            SnapshotConfig({'name': 'foo', 'size': 3}, static=True),
+            self.filename)
+        config = attach_snapshot(SnapshotConfig, self.filename, static=True)
+        self.assertEqual(config.name, u'foo')
+        self.assertRaises(
+            ValueError, attach_snapshot, SnapshotConfig, self.filename)
+
+    def test_attach_snapshot_wrong_class(self):
+        class OtherConfig(Config):
+            name = ConfigText("name")
+
+        write_snapshot(SnapshotConfig({'name': 'foo'}), self.filename)
+        self.assertRaises(
+            ValueError, attach_snapshot, OtherConfig, self.filename)
+
+    def test_attach_not_a_snapshot(self):
+        with open(self.filename, 'wb') as f:
+            json.dump({'name': 'foo'}, f)
+        self.assertRaises(
+            ValueError, attach_snapshot, SnapshotConfig, self.filename)
+
+    def test_attach_snapshot_validate(self):
+        with open(self.filename, 'wb') as f:
+            json.dump({'size': -1, SNAPSHOT_INFO_KEY: {
+                'config_class': __name__ + '.SnapshotConfig',
+                'static': False,
+            }}, f)
+        config = attach_snapshot(SnapshotConfig, self.filename)
+        self.assertEqual(config.size, -1)
+        self.assertRaises(
+            ConfigError, attach_snapshot, SnapshotConfig, self.filename,
+            validate=True)
+
+    def test_replace_snapshot(self):
+        write_snapshot(SnapshotConfig({'name': 'foo'}), self.filename)
+        old_config = attach_snapshot(SnapshotConfig, self.filename)
+        write_snapshot(SnapshotConfig({'name': 'bar'}), self.filename)
+        new_config = attach_snapshot(SnapshotConfig, self.filename)
+        self.assertEqual(old_config.name, u'foo')
+        self.assertEqual(new_config.name, u'bar')
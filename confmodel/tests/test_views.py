@@ -0,0 +1,88 @@
+from operator import setitem, delitem
+from unittest import TestCase
+
+from confmodel.views import freeze, FrozenDict, FrozenList
+
+
+class TestFreeze(TestCase):
+    def test_freeze(self):
+        self.assertTrue(isinstance(freeze({}), FrozenDict))
+        self.assertTrue(isinstance(freeze([]), FrozenList))
+        self.assertTrue(isinstance(freeze(()), FrozenList))
+        self.assertEqual(freeze("foo"), "foo")
+        self.assertEqual(freeze(None), None)
+
+
+class TestFrozenDict(TestCase):
+    def test_mapping(self):
+        view = FrozenDict({'a': 1, 'b': {'c': [2]}})
+        self.assertEqual(len(view), 2)
+        self.assertEqual(sorted(view), ['a', 'b'])
+        self.assertTrue('a' in view)
+        self.assertFalse('c' in view)
+        self.assertEqual(view['a'], 1)
+        self.assertEqual(view.get('z', 3), 3)
+        self.assertTrue(isinstance(view['b'], FrozenDict))
+        self.assertTrue(isinstance(view['b']['c'], FrozenList))
+
+    def test_equality(self):
+        data = {'a': 1, 'b': {'c': [2]}}
+        view = FrozenDict(data)
+        self.assertTrue(view == {'a': 1, 'b': {'c': [2]}})
+        self.assertTrue({'a': 1, 'b': {'c': [2]}} == view)
+        self.assertTrue(view == FrozenDict(dict(data)))
+        self.assertTrue(view != {'a': 1})
+        self.assertFalse(view == [])
+
+    def test_read_only(self):
+        view = FrozenDict({'a': 1})
+        self.assertRaises(TypeError, setitem, view, 'a', 2)
+        self.assertRaises(TypeError, delitem, view, 'a')
+        self.assertRaises(AttributeError, getattr, view, 'update')
+
+    def test_copy(self):
+        data = {'a': [1]}
+        view_copy = FrozenDict(data).copy()
+        self.assertEqual(type(view_copy), dict)
+        view_copy['a'].append(2)
+        self.assertEqual(data, {'a': [1]})
+
+
+class TestFrozenList(TestCase):
+    def test_sequence(self):
+        view = FrozenList([1, [2], {'a': 3}])
+        self.assertEqual(len(view), 3)
+        self.assertEqual(view[0], 1)
+        self.assertEqual(view[-1], {'a': 3})
+        self.assertTrue(isinstance(view[1], FrozenList))
+        self.assertTrue(isinstance(view[2], FrozenDict))
+        self.assertTrue(isinstance(view[1:], FrozenList))
+        self.assertEqual(view[1:], [[2], {'a': 3}])
+        self.assertEqual([type(v) for v in view], [
+            int, FrozenList, FrozenDict])
+        self.assertTrue(1 in view)
+        self.assertTrue(FrozenList([2]) in view)
+        self.assertEqual(view.index(1), 0)
+
+    def test_equality(self):
+        view = FrozenList((1, [2]))
+        self.assertTrue(view == [1, [2]])
+        self.assertTrue([1, [2]] == view)
+        self.assertTrue(view == (1, [2]))
+        self.assertTrue(view == FrozenList([1, [2]]))
+        self.assertTrue(view != [1])
+        self.assertTrue(view != [1, [3]])
+        self.assertFalse(view == {})
+
+    def test_read_only(self):
+        view = FrozenList([1])
+        self.assertRaises(TypeError, setitem, view, 0, 2)
+        self.assertRaises(AttributeError, getattr, view, 'append')
+
+    def test_copy(self):
+        data = ([1],)
+        view_copy = FrozenList(data).copy()
+        self.assertEqual(view_copy, [[1]])
+        self.assertEqual(type(view_copy), list)
+        view_copy[0].append(2)
+        self.assertEqual(data, ([1],))
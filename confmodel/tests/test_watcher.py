@@ -0,0 +1,216 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+from threading import Event
+from unittest import TestCase
+
+from confmodel.config import Config
+from confmodel.errors import ConfigError
+from confmodel.fields import ConfigInt, ConfigText
+from confmodel.watcher import FileConfigSource
+
+
+class WatchedConfig(Config):
+    name = ConfigText("name", required=True, static=True)
+    size = ConfigInt("size")
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestFileConfigSource(TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tempdir)
+        self.filename = os.path.join(self.tempdir, 'config.json')
+        self.mtime = 1000
+        self.loads = []
+        self.clock = FakeClock()
+
+    def write_config(self, data):
+        with open(self.filename, 'wb') as f:
+            f.write(data if isinstance(data, str) else json.dumps(data))
+        # Set the modification time explicitly, because several writes in a
+        # single test may happen within the filesystem's timestamp resolution.
+        self.mtime += 1
+        os.utime(self.filename, (self.mtime, self.mtime))
+
+    def load_data(self, filename):
+        with open(filename, 'rb') as f:
+            data = json.load(f)
+        self.loads.append(data)
+        return data
+
+    def make_source(self, data, **kw):
+        self.write_config(data)
+        kw.setdefault('load_data', self.load_data)
+        kw.setdefault('clock', self.clock)
+        source = FileConfigSource(WatchedConfig, self.filename, **kw)
+        self.addCleanup(source.stop)
+        del self.loads[:]
+        return source
+
+    def test_initial_config(self):
+        source = self.make_source({'name': 'foo', 'size': 1})
+        self.assertEqual((source.config.name, source.config.size), ('foo', 1))
+        self.assertIs(source.config, source.holder.config)
+        self.assertEqual(source.last_error, None)
+
+    def test_initial_config_invalid(self):
+        self.write_config({'size': 1})
+        self.assertRaises(
+            ConfigError, FileConfigSource, WatchedConfig, self.filename)
+
+    def test_default_load_data(self):
+        self.write_config({'name': 'foo'})
+        source = FileConfigSource(WatchedConfig, self.filename)
+        self.assertEqual(source.config.name, 'foo')
+
+    def test_static(self):
+        source = self.make_source({'name': 'foo'}, static=True)
+        self.assertTrue(source.config.static)
+
+    def test_no_change(self):
+        source = self.make_source({'name': 'foo'}, debounce=0)
+        self.assertFalse(source.check())
+        self.assertEqual(self.loads, [])
+
+    def test_reload(self):
+        source = self.make_source({'name': 'foo'}, debounce=0)
+        self.write_config({'name': 'bar'})
+        self.assertTrue(source.check())
+        self.assertEqual(source.config.name, 'bar')
+        self.assertFalse(source.check())
+        self.assertEqual(len(self.loads), 1)
+
+    def test_reload_debounced(self):
+        source = self.make_source({'name': 'foo'}, debounce=0.5)
+        self.write_config({'name': 'bar'})
+        self.assertFalse(source.check())
+        self.clock.now += 0.3
+        self.write_config({'name': 'baz'})
+        self.assertFalse(source.check())
+        self.clock.now += 0.3
+        self.assertFalse(source.check())
+        self.assertEqual(source.config.name, 'foo')
+        self.clock.now += 0.3
+        self.assertTrue(source.check())
+        self.assertEqual(source.config.name, 'baz')
+        self.assertEqual(self.loads, [{'name': 'baz'}])
+
+    def test_changed_back(self):
+        source = self.make_source({'name': 'foo'}, debounce=0.5)
+        original = os.stat(self.filename).st_mtime
+        self.write_config({'name': 'bar'})
+        self.assertFalse(source.check())
+        self.write_config({'name': 'foo'})
+        os.utime(self.filename, (original, original))
+        self.clock.now += 1
+        self.assertFalse(source.check())
+        self.assertEqual(self.loads, [])
+
+    def test_reload_invalid(self):
+        source = self.make_source({'name': 'foo'}, debounce=0)
+        config = source.config
+        self.write_config({'size': 1})
+        self.assertTrue(source.check())
+        self.assertIs(source.config, config)
+        self.assertTrue(isinstance(source.last_error, ConfigError))
+
+        self.write_config('{"name": ')
+        self.assertTrue(source.check())
+        self.assertIs(source.config, config)
+        self.assertTrue(isinstance(source.last_error, ValueError))
+
+        self.write_config({'name': 'bar'})
+        self.assertTrue(source.check())
+        self.assertEqual(source.config.name, 'bar')
+        self.assertEqual(source.last_error, None)
+
+    def test_file_removed(self):
+        source = self.make_source({'name': 'foo'}, debounce=0)
+        config = source.config
+        os.remove(self.filename)
+        self.assertTrue(source.check())
+        self.assertIs(source.config, config)
+        self.assertTrue(isinstance(source.last_error, IOError))
+
+    def test_on_reload(self):
+        reloads = []
+        source = self.make_source(
+            {'name': 'foo'}, debounce=0,
+            on_reload=lambda old, new: reloads.append((old.name, new.name)))
+        self.write_config({'name': 'bar'})
+        source.check()
+        self.write_config({})
+        source.check()
+        self.assertEqual(reloads, [('foo', 'bar')])
+
+    def test_on_reload_error(self):
+        def on_reload(old, new):
+            if new.name == 'bar':
+                raise ValueError("Restart failed.")
+
+        source = self.make_source(
+            {'name': 'foo'}, debounce=0, on_reload=on_reload)
+        self.write_config({'name': 'bar'})
+        self.assertTrue(source.check())
+        self.assertEqual(source.config.name, 'bar')
+        self.assertTrue(isinstance(source.last_error, ValueError))
+        self.write_config({'name': 'baz'})
+        self.assertTrue(source.check())
+        self.assertEqual(source.config.name, 'baz')
+        self.assertEqual(source.last_error, None)
+
+    def test_background_thread_survives_errors(self):
+        reloaded = Event()
+
+        def on_reload(old, new):
+            if new.name == 'bar':
+                raise ValueError("Restart failed.")
+            reloaded.set()
+
+        source = self.make_source(
+            {'name': 'foo'}, poll_interval=0.01, debounce=0.02,
+            on_reload=on_reload, clock=time.time)
+        source.check = self.fail_once(source.check)
+        source.start()
+        self.write_config({'name': 'bar'})
+        deadline = time.time() + 5
+        while source.config.name != 'bar' and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(source.config.name, 'bar')
+        self.write_config({'name': 'baz'})
+        self.assertTrue(reloaded.wait(5))
+        self.assertEqual(source.config.name, 'baz')
+        self.assertTrue(source._thread.is_alive())
+
+    def fail_once(self, func):
+        calls = []
+
+        def wrapper():
+            calls.append(None)
+            if len(calls) == 1:
+                raise OSError("Temporary failure.")
+            return func()
+        return wrapper
+
+    def test_background_thread(self):
+        reloaded = Event()
+        source = self.make_source(
+            {'name': 'foo'}, poll_interval=0.01, debounce=0.02,
+            on_reload=lambda old, new: reloaded.set(), clock=time.time)
+        source.start()
+        self.assertRaises(RuntimeError, source.start)
+        self.write_config({'name': 'bar'})
+        self.assertTrue(reloaded.wait(5))
+        self.assertEqual(source.config.name, 'bar')
+        source.stop()
+        self.assertEqual(source._thread, None)
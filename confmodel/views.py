@@ -0,0 +1,130 @@
+from collections import Mapping, Sequence
+from copy import deepcopy
+from itertools import izip
+
+
+def freeze(value):
+    """
+    Wrap a dict or list in a read-only view.
+
+    :param value:
+        Any value. Dicts, lists, and tuples are wrapped in a
+        :class:`FrozenDict` or :class:`FrozenList`, which wrap their own
+        contents as they are accessed. Other values are returned unchanged.
+    """
+    if isinstance(value, dict):
+        return FrozenDict(value)
+    if isinstance(value, (list, tuple)):
+        return FrozenList(value)
+    return value
+
+
+class FrozenDict(Mapping):
+    """
+    A read-only view of a dict.
+
+    No data is copied, so creating a view is cheap regardless of the size of
+    the dict. Changes to the underlying dict are visible through the view.
+
+    :param dict data:
+        The dict to wrap.
+    """
+
+    def __init__(self, data):
+        self._data = data
+
+    def __getitem__(self, key):
+        return freeze(self._data[key])
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __eq__(self, other):
+        if isinstance(other, FrozenDict):
+            other = other._data
+        if not isinstance(other, dict):
+            return NotImplemented
+        return self._data == other
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __repr__(self):
+        return "%s(%r)" % (type(self).__name__, self._data)
+
+    def copy(self):
+        """
+        Make a mutable copy of the underlying data.
+
+        :returns:
+            A deep copy of the wrapped dict.
+        """
+        return deepcopy(self._data)
+
+
+class FrozenList(Sequence):
+    """
+    A read-only view of a list or tuple.
+
+    No data is copied, so creating a view is cheap regardless of the size of
+    the list. Changes to the underlying list are visible through the view.
+
+    :param data:
+        The list or tuple to wrap.
+    """
+
+    def __init__(self, data):
+        self._data = data
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return FrozenList(self._data[index])
+        return freeze(self._data[index])
+
+    def __iter__(self):
+        for value in self._data:
+            yield freeze(value)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, value):
+        if isinstance(value, (FrozenDict, FrozenList)):
+            value = value._data
+        return value in self._data
+
+    def __eq__(self, other):
+        if isinstance(other, FrozenList):
+            other = other._data
+        if not isinstance(other, (list, tuple)):
+            return NotImplemented
+        if len(self._data) != len(other):
+            return False
+        return all(a == b for a, b in izip(self._data, other))
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __repr__(self):
+        return "%s(%r)" % (type(self).__name__, self._data)
+
+    def copy(self):
+        """
+        Make a mutable copy of the underlying data.
+
+        :returns:
+            A deep copy of the wrapped data, as a list.
+        """
+        return deepcopy(list(self._data))
@@ -0,0 +1,166 @@
+import json
+import os
+import time
+from threading import Event, Thread
+
+from confmodel.holder import ConfigHolder
+
+
+def load_json_file(filename):
+    """
+    Read config data from a JSON file.
+
+    :returns: The parsed contents of the file.
+    """
+    with open(filename, 'rb') as f:
+        return json.load(f)
+
+
+class FileConfigSource(object):
+    """
+    Keeps a config object up to date with a file.
+
+    The file is polled for changes to its modification time, size, or inode
+    (so editors that save by replacing the file are noticed). Once a change
+    has been seen and the file has stayed the same for ``debounce`` seconds,
+    the file is loaded and validated, and the new config object is published
+    to :attr:`holder`. Repeated saves within the debounce window only cause a
+    single reload. If loading or validation fails, the previous config object
+    is kept and the exception is stored in :attr:`last_error`.
+
+    Polling happens in a background thread started by :meth:`start`, or by
+    calling :meth:`check` directly.
+
+    :param config_cls:
+        The :class:`.Config` subclass to validate the file against.
+    :param str filename:
+        The path of the config file. It is loaded and validated immediately,
+        and any errors are raised.
+    :param bool static:
+        Passed to the config class.
+    :param load_data:
+        A function that takes a filename and returns config data. By default,
+        the file is read as JSON.
+    :param float poll_interval:
+        Seconds between checks of the file in the background thread.
+    :param float debounce:
+        Seconds the file must stay unchanged before it is reloaded.
+    :param on_reload:
+        An optional function called with the old and new config objects after
+        each successful reload. Exceptions it raises are stored in
+        :attr:`last_error`.
+    :param clock:
+        The function used to get the current time.
+
+    .. attribute:: holder
+
+        The :class:`~confmodel.holder.ConfigHolder` for the current config
+        object.
+
+    .. attribute:: last_error
+
+        The exception raised by the most recent reload (or by ``on_reload``
+        for it), or ``None`` if it succeeded.
+    """
+
+    def __init__(self, config_cls, filename, static=False,
+                 load_data=load_json_file, poll_interval=1.0, debounce=0.5,
+                 on_reload=None, clock=time.time):
+        self.filename = filename
+        self.load_data = load_data
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.on_reload = on_reload
+        self.last_error = None
+        self._clock = clock
+        self._loaded_stat = self._stat()
+        self._pending_stat = self._loaded_stat
+        self._changed_at = None
+        self._stopped = Event()
+        self._thread = None
+        self.holder = ConfigHolder(
+            config_cls(load_data(filename), static=static))
+
+    @property
+    def config(self):
+        """
+        The current config object.
+        """
+        return self.holder.config
+
+    def _stat(self):
+        try:
+            st = os.stat(self.filename)
+        except OSError:
+            return None
+        return (st.st_mtime, st.st_size, st.st_ino)
+
+    def check(self):
+        """
+        Check the file for changes and reload it if the debounce window has
+        passed.
+
+        :returns:
+            ``True`` if a reload was attempted, ``False`` otherwise.
+        """
+        now = self._clock()
+        stat = self._stat()
+        if stat != self._pending_stat:
+            self._pending_stat = stat
+            self._changed_at = now
+        if self._changed_at is None or now - self._changed_at < self.debounce:
+            return False
+        self._changed_at = None
+        if stat == self._loaded_stat:
+            # The file was changed back before the debounce window passed.
+            return False
+        self._loaded_stat = stat
+        self._reload()
+        return True
+
+    def _reload(self):
+        old_config = self.holder.config
+        try:
+            config = self.holder.reload(self.load_data(self.filename))
+        except Exception as e:
+            # Invalid values can cause errors other than ConfigError, and
+            # unreadable files cause IOError or ValueError.
+            self.last_error = e
+            return
+        self.last_error = None
+        if self.on_reload is not None:
+            try:
+                self.on_reload(old_config, config)
+            except Exception as e:
+                # The new config has been published, but the error is kept so
+                # that it isn't lost.
+                self.last_error = e
+
+    def start(self):
+        """
+        Start polling the file in a background thread.
+        """
+        if self._thread is not None:
+            raise RuntimeError("File config source already started.")
+        self._stopped.clear()
+        self._thread = Thread(target=self._run, name="FileConfigSource")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the background thread and wait for it to finish.
+        """
+        if self._thread is None:
+            return
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        while not self._stopped.wait(self.poll_interval):
+            try:
+                self.check()
+            except Exception as e:
+                # Keep polling, so later changes are still picked up.
+                self.last_error = e
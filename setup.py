@@ -19,9 +19,9 @@ setup(
     author='Praekelt Foundation',
     author_email='dev@praekeltfoundation.org',
     packages=find_packages(),
-    install_requires=[
-        'zope.interface',
-    ],
+    extras_require={
+        'zope': ['zope.interface'],
+    },
     classifiers=[
         'Development Status :: 4 - Beta',
         'Intended Audience :: Developers',